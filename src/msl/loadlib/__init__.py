@@ -1,16 +1,67 @@
 """
 Load a shared library.
 """
+from __future__ import annotations
+
+from typing import Any
+from typing import TYPE_CHECKING
+
 from .__about__ import __author__
 from .__about__ import __copyright__
 from .__about__ import __version__
 from .__about__ import version_info
-from .client64 import Client64
 from .constants import IS_PYTHON_64BIT
 from .exceptions import ConnectionTimeoutError
 from .exceptions import ResponseTimeoutError
 from .exceptions import Server32Error
 from .load_library import LoadLibrary
-from .server32 import Server32
 from .utils import generate_com_wrapper
 from .utils import get_com_info
+
+if TYPE_CHECKING:
+    from .client64 import Client64
+    from .server32 import Server32
+
+__all__ = [
+    '__version__',
+    'Client64',
+    'ConnectionTimeoutError',
+    'IS_PYTHON_64BIT',
+    'LoadLibrary',
+    'ResponseTimeoutError',
+    'Server32',
+    'Server32Error',
+    'client64',
+    'constants',
+    'exceptions',
+    'generate_com_wrapper',
+    'get_com_info',
+    'load_library',
+    'server32',
+    'utils',
+    'version_info',
+]
+
+# The names that are imported the first time that they are accessed
+_LAZY_NAMES: tuple[str, ...] = ('Client64', 'Server32', 'client64', 'server32')
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_LAZY_NAMES})
+
+
+def __getattr__(name: str) -> Any:
+    # Client64 and Server32 import the http and inspect modules, which
+    # are not needed to load a library in the current Python process
+    if name == 'Client64':
+        from .client64 import Client64
+        globals()[name] = Client64
+        return Client64
+    if name == 'Server32':
+        from .server32 import Server32
+        globals()[name] = Server32
+        return Server32
+    if name in ('client64', 'server32'):
+        from importlib import import_module
+        return import_module(f'.{name}', __name__)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
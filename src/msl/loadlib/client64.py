@@ -288,6 +288,12 @@ class HTTPClient:
                 server_exe = f
                 break
 
+            # the server was frozen as a directory (PyInstaller --onedir)
+            f = os.path.join(f, SERVER_FILENAME)
+            if os.path.isfile(f):
+                server_exe = f
+                break
+
         if server_exe is None:
             if len(dirs) == 1:
                 raise OSError(f'Cannot find {os.path.join(dirs[0], SERVER_FILENAME)}')
@@ -488,8 +494,11 @@ class HTTPClient:
         except OSError:
             pass  # the server has already stopped
 
-        # cleans up PyInstaller issue #2379 if the server was killed
-        shutil.rmtree(unfrozen_dir, ignore_errors=True)
+        # cleans up PyInstaller issue #2379 if the server was killed,
+        # a server that was frozen as a directory is not unpacked to a
+        # temporary _MEI directory and its directory must not be removed
+        if os.path.basename(unfrozen_dir.rstrip('/\\')).startswith('_MEI'):
+            shutil.rmtree(unfrozen_dir, ignore_errors=True)
 
         try:
             os.remove(self._meta_path)
@@ -7,17 +7,114 @@ There is also a :ref:`command-line utility <refreeze-cli>` to create a server.
 from __future__ import annotations
 
 import os
+import re
 import sys
-from importlib import import_module
-from subprocess import check_call
-from tempfile import TemporaryDirectory
+from contextlib import contextmanager
+from functools import lru_cache
+from functools import partial
+from string import Template
+from typing import Any
+from typing import Callable
 from typing import Iterable
-from urllib.request import urlopen
+from typing import Iterator
+from typing import TYPE_CHECKING
 
 from msl import loadlib
 from msl.loadlib import constants
 from msl.loadlib import version_info
 
+if TYPE_CHECKING:
+    from importlib.machinery import ModuleSpec
+
+
+# The frozen application is not meant to create GUIs, to add support for
+# building and installing Python modules or to run CPython's test suite.
+# Excluding a package also excludes all of its submodules.
+_EXCLUDE_MODULES: tuple[str, ...] = (
+    '__main__',
+    'antigravity',
+    'ctypes.test',
+    'distutils',
+    'ensurepip',
+    'idlelib',
+    'lib2to3',
+    'pydoc_data',
+    'sqlite3.test',
+    'test',
+    'this',
+    'tkinter',
+    'turtle',
+    'unittest.test',
+)
+
+# The submodules of the standard library that are only for Windows (e.g.,
+# asyncio.windows_events, ctypes.wintypes and the mbcs codec) or only for POSIX
+# (e.g., asyncio.unix_events and multiprocessing.popen_fork)
+_WINDOWS_SUBMODULES = re.compile(r'.+\.(?:.*_win32|win(?:dows_.+|types)|mbcs|oem|cp65001|.*msvc.*)$')
+_POSIX_SUBMODULES = re.compile(r'.+\.(?:unix_events|popen_fork|popen_forkserver|popen_spawn_posix)$')
+
+# The modules in the standard-library directories that are for testing
+# CPython (or are generated when building it) and are not real modules
+_STDLIB_SCAN_IGNORE = re.compile(r'_?test|_ctypes_test|_?xx|_sysconfigdata|site-packages')
+
+# The number of seconds that the cached Python Module Index is valid for
+_MODINDEX_CACHE_TTL: int = 7 * 24 * 60 * 60
+
+# The directory that contains the files to freeze
+_HERE: str = os.path.abspath(os.path.dirname(__file__))
+
+# The number of frozen servers to keep in the cache
+_FROZEN_CACHE_SIZE: int = 10
+
+# The PyInstaller options that do not change between servers that are not frozen from a spec file
+_SERVER_ARGS: tuple[str, ...] = (
+    '--python-option', 'u',
+    '--name', constants.SERVER_FILENAME,
+    # the binaries would otherwise be UPX compressed (if UPX is available)
+    # and be decompressed every time that the server starts
+    '--noupx',
+)
+
+# Increment if a change to this module changes the PyInstaller options for the
+# standard-library modules, so that the options that were cached are ignored
+_STDLIB_CACHE_VERSION: int = 2
+
+# The version info file for Windows, see _version_info_text()
+_VERSION_INFO_TEMPLATE = Template("""# UTF-8
+#
+# For more details about fixed file info 'ffi' see:
+# https://docs.microsoft.com/en-us/windows/win32/api/verrsrc/ns-verrsrc-vs_fixedfileinfo
+# For language and charset parameters see:
+# https://docs.microsoft.com/en-us/windows/win32/menurc/stringfileinfo-block
+VSVersionInfo(
+  ffi=FixedFileInfo(
+    filevers=($major, $minor, $micro, 0),
+    prodvers=($py_major, $py_minor, $py_micro, 0),
+    mask=0x3f,
+    flags=0x0,
+    OS=0x40004,
+    fileType=0x1,
+    subtype=0x0,
+    date=(0, 0)
+    ),
+  kids=[
+    StringFileInfo(
+      [
+      StringTable(
+        '000004B0',
+        [StringStruct('CompanyName', '$author'),
+        StringStruct('FileDescription', 'Access a 32-bit library from 64-bit Python'),
+        StringStruct('FileVersion', '$major.$minor.$micro.0'),
+        StringStruct('InternalName', '$filename'),
+        StringStruct('LegalCopyright', '$copyright'),
+        StringStruct('OriginalFilename', '$filename'),
+        StringStruct('ProductName', 'Python'),
+        StringStruct('ProductVersion', '$py_major.$py_minor.$py_micro.0')])
+      ]), 
+    VarFileInfo([VarStruct('Translation', [0, 1200])])
+  ]
+)
+""")
 
 # When freezing for a new release, use
 # Windows: imports=['msl.examples.loadlib', 'comtypes', 'pythonnet']
@@ -29,7 +126,12 @@ def main(*,
          dest: str | None = None,
          imports: str | Iterable[str] | None = None,
          data: str | Iterable[str] | None = None,
-         skip_32bit_check: bool = False) -> None:
+         skip_32bit_check: bool = False,
+         use_subprocess: bool = False,
+         fresh: bool = False,
+         strip: bool = True,
+         optimize: int = 0,
+         onefile: bool = True) -> None:
     """Create a frozen server.
 
     This function should be run using a 32-bit Python interpreter with
@@ -43,7 +145,8 @@ def main(*,
 
     .. versionchanged:: 1.0
        Removed the `requires_pythonnet` and `requires_comtypes` arguments.
-       Added the `imports`, `data` and `skip_32bit_check` arguments.
+       Added the `imports`, `data`, `skip_32bit_check`, `use_subprocess`,
+       `fresh`, `strip`, `optimize` and `onefile` arguments.
 
     .. _PyInstaller: https://www.pyinstaller.org/
 
@@ -66,6 +169,46 @@ def main(*,
         the server. Before you create a 64-bit server, decide if
         :ref:`msl-loadlib-mock-connection` is a better solution for your
         application.
+    :param use_subprocess: Whether to run `PyInstaller`_ in a subprocess. By
+        default, `PyInstaller`_ runs in the current Python interpreter, which
+        avoids starting (and importing `PyInstaller`_ in) another interpreter.
+        Set this value to :data:`True` if the freezing must be isolated from
+        the current process.
+    :param fresh: A single-file server that is not created from a `spec` file
+        is cached and it is reused, without running `PyInstaller`_, if the
+        versions of Python and `PyInstaller`_, the modules of MSL-LoadLib, the
+        files of the `imports`, the `data` files and the site-packages
+        directories have not changed since the server was frozen (installing,
+        upgrading or removing a package changes a site-packages directory).
+        A module that one of the `imports` depends on, which is not in a
+        site-packages directory (e.g., a module in the current directory that
+        is not one of the `imports`), is not checked. The servers are cached
+        in the ``frozen`` directory of the msl-loadlib cache directory
+        (``%LOCALAPPDATA%\\msl-loadlib`` on Windows, ``~/Library/Caches/msl-loadlib``
+        on macOS and ``$XDG_CACHE_HOME/msl-loadlib`` or ``~/.cache/msl-loadlib``
+        otherwise) and only the 10 most recently used servers are kept.
+        `PyInstaller`_ also reuses its work directory from a previous build.
+        Set this value to :data:`True` to ignore the cached server, and to
+        clean the work directory, so that the server is frozen from scratch.
+    :param strip: Whether to strip the symbol tables from the executable and
+        the shared libraries of the server (``pyinstaller --strip``), which
+        makes the server smaller. Only applies on Linux and macOS and if a
+        `spec` file is not specified. Set this value to :data:`False` to keep
+        the debug symbols.
+    :param optimize: The optimization level (0, 1 or 2) to compile the modules
+        of the server with (``pyinstaller --optimize``). Level 1 removes
+        ``assert`` statements and level 2 also removes docstrings, which
+        makes the server smaller, but only use it if none of the `imports`
+        rely on assertions or docstrings. Requires `PyInstaller`_ >= 6.0
+        and only applies if a `spec` file is not specified.
+    :param onefile: Whether to create the server as a single executable file.
+        If :data:`False`, the server is created as a directory (named
+        ``server32-windows.exe`` or ``server32-linux``) that contains the
+        executable of the same name and its dependencies. A server in a
+        directory starts faster, since the bootloader does not need to
+        extract the dependencies to a temporary directory every time the
+        server starts, but a directory cannot be copied from the cache of
+        frozen servers. Only applies if a `spec` file is not specified.
 
     .. attention::
         If a value for `spec` is specified, then `imports` nor `data` may be
@@ -86,62 +229,93 @@ def main(*,
               file=sys.stderr)
         return
 
-    try:
-        from PyInstaller import __version__ as pyinstaller_version  # noqa: PyInstaller is not a dependency
-    except ImportError:
+    pyinstaller_version = _pyinstaller_version()
+    if pyinstaller_version is None:
         print('PyInstaller must be installed to create the server, run:\n'
               'pip install pyinstaller', file=sys.stderr)
         return
 
+    # an iterable may be a generator, which can only be iterated over once
+    if isinstance(imports, str):
+        imports = [imports]
+    elif imports is not None:
+        imports = list(dict.fromkeys(imports))  # remove duplicates, keep the order
+
+    if isinstance(data, str):
+        data = [data]
+    elif data is not None:
+        data = list(data)
+
     if spec and (imports or data):
         print('Cannot specify a spec file and imports/data', file=sys.stderr)
         return
 
-    here = os.path.abspath(os.path.dirname(__file__))
+    if spec is not None:
+        # PyInstaller may run in a process that has a different working directory
+        spec = os.path.abspath(spec)
 
     if dest is not None:
         dist_path = os.path.abspath(dest)
     else:
         dist_path = os.getcwd()
 
-    tmp_dir = TemporaryDirectory(ignore_cleanup_errors=True)
-    work_path = tmp_dir.name
+    # PyInstaller reuses the analysis that is in the work directory from a
+    # previous build, unless the --clean flag is specified
+    bits = 64 if constants.IS_PYTHON_64BIT else 32
+    work_path = os.path.join(_cache_dir(), 'workpath',
+                             f'{sys.version_info.major}.{sys.version_info.minor}-{bits}bit')
+    os.makedirs(work_path, exist_ok=True)
     server_path = os.path.join(dist_path, constants.SERVER_FILENAME)
 
-    # Specifically invoke pyinstaller in the context of the current python interpreter.
-    # This fixes the issue where the blind `pyinstaller` invocation points to a 64-bit version.
-    cmd = [sys.executable, '-m', 'PyInstaller',
-           '--distpath', dist_path,
+    cmd = ['--distpath', dist_path,
            '--workpath', work_path,
-           '--noconfirm',
-           '--clean']
+           '--noconfirm']
+
+    if fresh:
+        cmd.append('--clean')
+
+    # the options that change the frozen server (and are part of the cache key)
+    options = []
 
     if spec is None:
-        cmd.extend(['--specpath', work_path,
-                    '--python-option', 'u'])
+        cmd += ('--specpath', work_path, *_SERVER_ARGS)
 
-        if constants.IS_WINDOWS:
-            cmd.extend(['--version-file', _create_version_info_file(work_path)])
+        # the symbols are not needed at runtime, PyInstaller does not
+        # recommend stripping on Windows
+        if strip and not constants.IS_WINDOWS:
+            options.append('--strip')
+
+        if onefile:
+            options.append('--onefile')
+        else:
+            options.append('--onedir')
+            server_path = os.path.join(server_path, constants.SERVER_FILENAME)
+
+        if optimize:
+            if int(pyinstaller_version.partition('.')[0]) < 6:
+                print('PyInstaller >= 6.0 is required to optimize the server',
+                      file=sys.stderr)
+                return
+            options += ('--optimize', str(optimize))
 
-        cmd.extend([
-            '--name', constants.SERVER_FILENAME,
-            '--onefile',
-        ])
+        if constants.IS_WINDOWS:
+            cmd += ('--version-file', _create_version_info_file(work_path))
 
         if imports:
-            if isinstance(imports, str):
-                imports = [imports]
+            # the modules may be in the current directory, which PyInstaller
+            # must also search when it analyses the imports
+            cwd = os.getcwd()
+            cmd += ('--paths', cwd)
 
-            sys.path.append(os.getcwd())
+            with _added_sys_path(cwd):
+                module_specs = _thread_map(_find_spec, imports)
 
             missing = []
-            for module in imports:
-                try:
-                    import_module(module)
-                except ImportError:
+            for module, module_spec in zip(imports, module_specs):
+                if module_spec is None:
                     missing.append(module)
                 else:
-                    cmd.extend(['--hidden-import', module])
+                    cmd += ('--hidden-import', module)
 
             if missing:
                 print(f'The following modules cannot be imported: '
@@ -149,39 +323,51 @@ def main(*,
                       f'Cannot freeze the server', file=sys.stderr)
                 return
 
+        for module in _EXCLUDE_MODULES:
+            cmd += ('--exclude-module', module)
+
         cmd.extend(_get_standard_modules())
 
         if data:
-            major, *rest = pyinstaller_version.split('.')
-            sep = os.pathsep if int(major) < 6 else ':'
-
-            if isinstance(data, str):
-                data = [data]
-
-            for item in data:
-                s = item.split(':')
-                if len(s) == 1:
-                    src = s[0]
-                    dst = ''
-                elif len(s) == 2:
-                    src = s[0]
-                    dst = s[1] or '.'
-                else:
-                    print(f'Invalid data format {item!r}', file=sys.stderr)
-                    return
-
-                src = os.path.abspath(src)
-                if not os.path.exists(src):
-                    print(f'Cannot find {src!r}', file=sys.stderr)
-                    return
-
-                cmd.extend(['--add-data', f'{src}{sep}{dst}'])
+            sep = _add_data_sep(pyinstaller_version)
+            try:
+                for value in _thread_map(partial(_resolve_data_item, sep=sep), data):
+                    cmd += ('--add-data', value)
+            except OSError as e:
+                print(f'Cannot find {e.filename!r}', file=sys.stderr)
+                return
 
-        cmd.append(os.path.join(here, 'start_server32.py'))
+        cmd.extend(options)
+        cmd.append(os.path.join(_HERE, 'start_server32.py'))
     else:
         cmd.append(spec)
 
-    check_call(cmd)
+    # only a single-file server is cached, a spec file may refer to other
+    # files (scripts, hooks, data, ...) that are not part of the cache key
+    cached_path = None
+    if spec is None and onefile:
+        cached_path = os.path.join(
+            _cache_dir(), 'frozen',
+            _freeze_cache_key(pyinstaller_version=pyinstaller_version,
+                              imports=imports or (), data=data or (),
+                              options=options),
+            constants.SERVER_FILENAME)
+
+    if cached_path and not fresh and os.path.isfile(cached_path):
+        import shutil
+        os.makedirs(dist_path, exist_ok=True)
+        shutil.copy2(cached_path, server_path)
+        _touch(os.path.dirname(cached_path))  # the server was used most recently
+    else:
+        # servers that are frozen at the same time (e.g., by parallel CI jobs)
+        # must not overwrite each other's files in the work directory
+        with _file_lock(f'{work_path}.lock'):
+            if use_subprocess:
+                _run_pyinstaller_subprocess(cmd)
+            else:
+                _run_pyinstaller(cmd)
+        if cached_path:
+            _store_frozen_server(server_path, cached_path)
 
     # maybe create the .NET Framework config file
     if imports and ('pythonnet' in imports):
@@ -191,73 +377,787 @@ def main(*,
     return 0
 
 
-def _get_standard_modules() -> list[str]:
+def _pyinstaller_version() -> str | None:
+    """Returns the version of PyInstaller.
+
+    PyInstaller is not imported if its distribution metadata is available, so
+    that a server that is copied from the cache does not pay for the import.
+
+    :return: The version or :data:`None` if PyInstaller is not installed.
+    """
+    if _find_spec('PyInstaller') is None:
+        return None
+
+    from importlib.metadata import PackageNotFoundError
+    from importlib.metadata import version
+
+    try:
+        return version('pyinstaller')
+    except PackageNotFoundError:
+        # PyInstaller is importable, but it was not installed as a distribution
+        from PyInstaller import __version__  # noqa: PyInstaller is not a dependency
+        return __version__
+
+
+def _freeze_cache_key(*,
+                      pyinstaller_version: str,
+                      imports: Iterable[str],
+                      data: Iterable[str],
+                      options: Iterable[str] = ()) -> str:
+    """Returns the key of a frozen server in the cache.
+
+    The key is a BLAKE2 digest of the inputs that determine the frozen server.
+    The contents of the `data` files and the modules of msl-loadlib (any of which may be bundled with the server) are hashed.
+    The source of an import is compared by the size and modification time
+    of its files. The dependencies of the imports are only known once
+    PyInstaller has analysed them, so the modification times of the
+    site-packages directories (which change when a package is installed,
+    upgraded or removed) are used instead.
+
+    :param pyinstaller_version: The version of PyInstaller.
+    :param imports: The names of the modules to import on the server.
+    :param data: The `data` values, in the form `source:dest_dir`.
+    :param options: Additional PyInstaller options.
+    :return: The hex digest.
+    """
+    import hashlib
+
+    h = hashlib.blake2b(digest_size=16)
+
+    def update(*values):
+        for value in values:
+            h.update(str(value).encode())
+            h.update(b'\0')
+
+    update(pyinstaller_version, sys.version, sys.executable, loadlib.__version__, *options)
+
+    sources = [os.path.join(_HERE, f) for f in sorted(os.listdir(_HERE)) if f.endswith('.py')]
+    for path in sources:
+        update(path)
+        _hash_contents(h, path)
+
+    for path in _site_packages():
+        try:
+            update(path, os.stat(path).st_mtime_ns)
+        except OSError:
+            update(path)
+
+    with _added_sys_path(os.getcwd()):
+        for module in sorted(imports):
+            update(module)
+            module_spec = _find_spec(module)
+            if module_spec is None:
+                continue
+            locations = module_spec.submodule_search_locations or [module_spec.origin]
+            for location in locations:
+                if location and os.path.exists(location):
+                    for path in _iter_files(location):
+                        st = os.stat(path)
+                        update(path, st.st_size, st.st_mtime_ns)
+
+    for item in data:
+        src, dst = _split_data_spec(item)
+        src = os.path.abspath(src)
+        update(src, dst)
+        if os.path.exists(src):
+            for path in _iter_files(src):
+                update(os.path.relpath(path, src))
+                _hash_contents(h, path)
+
+    return h.hexdigest()
+
+
+def _site_packages() -> list[str]:
+    """Returns the site-packages directories of the running interpreter."""
+    import site
+    import sysconfig
+
+    paths = [sysconfig.get_path('purelib'), sysconfig.get_path('platlib')]
+    if hasattr(site, 'getsitepackages'):
+        paths.extend(site.getsitepackages())
+    if site.ENABLE_USER_SITE:
+        paths.append(site.getusersitepackages())
+    return list(dict.fromkeys(paths))
+
+
+def _iter_files(path: str) -> Iterator[str]:
+    """Yields the path of a file, or the paths of all files in a directory, in a sorted order."""
+    if not os.path.isdir(path):
+        yield path
+        return
+
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for file in sorted(files):
+            yield os.path.join(root, file)
+
+
+def _hash_contents(h: Any, path: str) -> None:
+    """Update a hash object with the contents of a file, in chunks."""
+    with open(path, mode='rb') as fp:
+        while True:
+            chunk = fp.read(1 << 20)
+            if not chunk:
+                break
+            h.update(chunk)
+
+
+def _store_frozen_server(server_path: str, cached_path: str) -> None:
+    """Copy a frozen server to the cache.
+
+    The servers that were used least recently are removed from the cache,
+    so that only :data:`_FROZEN_CACHE_SIZE` servers are kept.
+
+    :param server_path: The path to the frozen server.
+    :param cached_path: The path to store the server at.
     """
-    Returns a list of standard python modules to include and exclude in the
+    import shutil
+
+    tmp_path = f'{cached_path}.{os.getpid()}.tmp'
+    try:
+        os.makedirs(os.path.dirname(cached_path), exist_ok=True)
+        shutil.copy2(server_path, tmp_path)
+        os.replace(tmp_path, cached_path)
+    except OSError:
+        # caching is an optimisation, the server has already been frozen
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return
+
+    _touch(os.path.dirname(cached_path))
+
+    # the directory of each key is touched when its server is used
+    root = os.path.dirname(os.path.dirname(cached_path))
+    keys = []
+    for entry in os.scandir(root):
+        try:
+            if entry.is_dir():
+                keys.append((entry.stat().st_mtime_ns, entry.path))
+        except OSError:
+            pass
+    keys.sort(reverse=True)
+    for _, path in keys[_FROZEN_CACHE_SIZE:]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def _touch(path: str) -> None:
+    """Set the modification time of a path to the current time (if possible)."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def _find_spec(name: str) -> ModuleSpec | None:
+    """Locate a module without executing it.
+
+    Only the parent package (if any) of a submodule gets imported.
+
+    :param name: The name of the module.
+    :return: The spec of the module or :data:`None` if it cannot be found.
+    """
+    from importlib.util import find_spec
+
+    try:
+        return find_spec(name)
+    except (ImportError, ValueError):
+        # ValueError is raised if the module is in sys.modules and its __spec__ is None
+        return None
+
+
+def _thread_map(func: Callable[[Any], Any], items: list) -> list:
+    """Call a function with each item in a thread pool.
+
+    The calls are I/O bound (the directories on :data:`sys.path` are
+    searched or a file is stat'ed), so they overlap. An exception that
+    the function raises is re-raised in the order of the items.
+
+    :param func: The function to call.
+    :param items: The items to call the function with.
+    :return: The values that the function returned, in the order of the items.
+    """
+    if len(items) < 2:
+        return [func(item) for item in items]
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=min(8, len(items))) as executor:
+        return list(executor.map(func, items))
+
+
+@contextmanager
+def _added_sys_path(path: str) -> Iterator[None]:
+    """Temporarily append a directory to :data:`sys.path`.
+
+    :param path: The directory to append.
+    """
+    from importlib import invalidate_caches
+
+    sys.path.append(path)
+    invalidate_caches()
+    try:
+        yield
+    finally:
+        # remove the appended item, not an earlier occurrence of the same directory
+        for i in range(len(sys.path) - 1, -1, -1):
+            if sys.path[i] == path:
+                del sys.path[i]
+                break
+
+
+@contextmanager
+def _file_lock(path: str) -> Iterator[None]:
+    """Hold an exclusive lock on a file, which other processes also lock.
+
+    Blocks until the lock is acquired.
+
+    :param path: The path to the lock file (it is created if it does not exist).
+    """
+    try:
+        import fcntl
+    except ImportError:  # Windows
+        fcntl = None
+
+    with open(path, mode='ab') as fp:
+        if fcntl is not None:
+            fcntl.flock(fp.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fp.fileno(), fcntl.LOCK_UN)
+            return
+
+        import msvcrt
+        fp.seek(0)
+        while True:
+            try:
+                # LK_LOCK tries for 10 seconds before it raises
+                msvcrt.locking(fp.fileno(), msvcrt.LK_LOCK, 1)
+                break
+            except OSError:
+                pass
+        try:
+            yield
+        finally:
+            fp.seek(0)
+            msvcrt.locking(fp.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _run_pyinstaller(args: list[str]) -> None:
+    """Run PyInstaller in the current process.
+
+    A :exc:`SystemExit` from PyInstaller, that is not a successful exit, is
+    re-raised as a :exc:`~subprocess.CalledProcessError` so that it propagates
+    out of a worker process in the same way that a failed
+    :func:`~subprocess.check_call` does. PyInstaller often exits with a
+    message (e.g., ``SystemExit('Spec file "x" not found!')``), which is
+    printed to stderr and the return code is then 1 (like the interpreter does).
+
+    :param args: The command-line arguments for PyInstaller.
+    """
+    from PyInstaller.__main__ import run  # noqa: PyInstaller is not a dependency
+    try:
+        run(args)
+    except SystemExit as e:
+        if e.code is None or e.code == 0:
+            return
+
+        code = e.code
+        if not isinstance(code, int):
+            print(code, file=sys.stderr)
+            code = 1
+
+        from subprocess import CalledProcessError
+        raise CalledProcessError(code, ['PyInstaller', *args]) from None
+
+
+def _run_pyinstaller_subprocess(args: list[str]) -> None:
+    """Run PyInstaller in a separate process.
+
+    On POSIX, the process is forked from a forkserver that has already
+    imported PyInstaller, so that freezing multiple servers in the same
+    session does not pay the cost of starting an interpreter and importing
+    PyInstaller each time. The worker process exits when the freeze is done.
+    On Windows, which cannot fork, a new interpreter is started.
+
+    The working directory of the worker process is the working directory of
+    the forkserver, so all paths in `args` must be absolute.
+
+    :param args: The command-line arguments for PyInstaller.
+    """
+    if constants.IS_WINDOWS:
+        from subprocess import check_call
+
+        # Specifically invoke pyinstaller in the context of the current python interpreter.
+        # This fixes the issue where the blind `pyinstaller` invocation points to a 64-bit version.
+        check_call([sys.executable, '-m', 'PyInstaller', *args])
+        return
+
+    import multiprocessing
+
+    # the preload only applies when the forkserver starts (the first time
+    # that a process is created from it) and it is harmless to set again
+    ctx = multiprocessing.get_context('forkserver')
+    ctx.set_forkserver_preload(['PyInstaller.__main__'])
+    with ctx.Pool(processes=1) as pool:
+        pool.apply(_run_pyinstaller, (args,))
+
+
+def _split_data_spec(item: str) -> tuple[str, str]:
+    """Split a `data` value into its source and destination parts.
+
+    The value has the form `source:dest_dir`, where `:dest_dir` is optional.
+    A drive letter in `source` (e.g., ``C:\\data:bin``) is not treated as the
+    separator on Windows.
+
+    :param item: The `data` value.
+    :return: The (source, dest_dir) parts. The destination is ``'.'``,
+        the top-level directory of the frozen server, if not specified.
+    """
+    if constants.IS_WINDOWS and len(item) >= 2 and item[1] == ':' and item[0].isalpha():
+        head, sep, tail = item[2:].rpartition(':')
+        if sep:
+            return item[:2] + head, tail or '.'
+        return item, '.'
+
+    head, sep, tail = item.rpartition(':')
+    if sep:
+        return head, tail or '.'
+    return item, '.'
+
+
+@lru_cache(maxsize=None)
+def _add_data_sep(version: str) -> str:
+    """Returns the separator between the source and destination of ``--add-data``.
+
+    :param version: The version of PyInstaller.
+    """
+    major = int(version.partition('.')[0])
+    return os.pathsep if major < 6 else ':'
+
+
+def _resolve_data_item(item: str, sep: str) -> str:
+    """Convert a `data` value into the value of PyInstaller's ``--add-data`` option.
+
+    A directory is passed to PyInstaller as is (PyInstaller adds the files in it).
+
+    :param item: The `data` value, in the form `source:dest_dir`.
+    :param sep: The separator between the source and destination that
+        PyInstaller expects.
+    :return: The ``--add-data`` value, with `source` as an absolute path.
+    :raises OSError: If `source` does not exist.
+    """
+    src, dst = _split_data_spec(item)
+    src = os.path.abspath(src)
+    os.stat(src)  # raises FileNotFoundError, with the filename, if src does not exist
+    return f'{src}{sep}{dst}'
+
+
+@lru_cache(maxsize=None)
+def _get_standard_modules() -> tuple[str, ...]:
+    """
+    Returns the standard python modules to include and exclude in the
     frozen application.
 
+    The modules are determined once per process and, if the names of the
+    standard-library modules are known, the options are also cached in
+    :func:`_cache_dir` (see :func:`_load_stdlib_module_args`).
+
     PyInstaller does not automatically bundle all the standard Python modules
-    into the frozen application. This method parses the 'docs.python.org'
-    website for the list of standard Python modules that are available.
+    into the frozen application. The names of the top-level modules are from
+    :data:`sys.stdlib_module_names` (Python 3.10+) or from the list that is
+    bundled with msl-loadlib (Python < 3.10). The packages are expanded into
+    their public submodules without importing them. The 'docs.python.org'
+    website is only parsed if neither source is available, and if the website
+    cannot be reached the standard-library directories are scanned.
 
     The 'pyinstaller --exclude-module' option ensures that the module is
-    excluded from the frozen application.
+    excluded from the frozen application. Only the platform-specific modules
+    are excluded here, the packages in :data:`_EXCLUDE_MODULES` are excluded
+    directly by :func:`main`.
 
     The 'pyinstaller --hidden-import' option ensures that the module is included
     into the frozen application (only if the module is available for the operating
     system that is running this script).
 
-    :return: A list of modules to be included and excluded.
+    :return: The PyInstaller options for the modules to be included and excluded.
     """
-    # the frozen application is not meant to create GUIs or to add
-    # support for building and installing Python modules
-    ignore_list = [
-        '__main__',
-        'distutils',
-        'ensurepip',
-        'idlelib',
-        'lib2to3',
-        'test',
-        'tkinter',
-        'turtle'
-    ]
+    names = _stdlib_module_names()
+    if names is not None:
+        return _load_stdlib_module_args(names)
 
+    try:
+        platform_modules, modules = _get_modindex_modules()
+    except OSError:
+        # docs.python.org cannot be reached and nothing is cached
+        platform_modules, modules = _expand_stdlib_modules(_scan_stdlib_module_names())
+    return _module_args(platform_modules, modules)
+
+
+def _load_stdlib_module_args(names: Iterable[str]) -> tuple[str, ...]:
+    """Load the PyInstaller options for the standard-library modules.
+
+    Expanding the packages into their submodules walks the standard-library
+    directories, so the options are cached in :func:`_cache_dir`. The cache
+    is ignored if the Python installation, the names of the modules, the
+    version of msl-loadlib, the :data:`_EXCLUDE_MODULES` or
+    :data:`_STDLIB_CACHE_VERSION` changed.
+
+    :param names: The names of the top-level standard-library modules.
+    :return: The PyInstaller options for the modules to be included and excluded.
+    """
+    import hashlib
+    import json
+
+    bits = 64 if constants.IS_PYTHON_64BIT else 32
+    path = os.path.join(_cache_dir(), f'stdlib-modules-{sys.version_info.major}.{sys.version_info.minor}'
+                                      f'-{sys.platform}-{bits}bit.json')
+    key = {
+        'cache_version': _STDLIB_CACHE_VERSION,
+        'loadlib_version': loadlib.__version__,
+        'exclude': hashlib.blake2b('\0'.join(_EXCLUDE_MODULES).encode(), digest_size=16).hexdigest(),
+        'version': sys.version,
+        'prefix': sys.base_prefix,
+        'names': sorted(names),
+    }
+    try:
+        with open(path, mode='rt', encoding='utf-8') as fp:
+            obj = json.load(fp)
+        if obj['key'] == key:
+            return tuple(obj['args'])
+    except (OSError, ValueError, TypeError, KeyError):
+        pass  # the cache does not exist, is corrupt or is for another installation
+
+    args = _module_args(*_expand_stdlib_modules(names))
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, mode='wt', encoding='utf-8') as fp:
+            json.dump({'key': key, 'args': args}, fp)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # caching is an optimisation, freezing can still continue
+    return args
+
+
+def _module_args(platform_modules: Iterable[str], modules: Iterable[str]) -> tuple[str, ...]:
+    """Returns the PyInstaller options to exclude the platform-specific modules
+    and to include the other modules.
+
+    A module is not included if it is (or is in) a package in :data:`_EXCLUDE_MODULES`,
+    if it is the private extension of such a package (e.g., ``_tkinter``), if it
+    is for testing CPython (e.g., ``_testcapi``) or if it is a submodule for
+    another operating system (e.g., ``asyncio.windows_events`` on Linux).
+    """
+    other_platform = _POSIX_SUBMODULES if constants.IS_WINDOWS else _WINDOWS_SUBMODULES
+    args = []
+    for module in dict.fromkeys(modules):  # remove duplicates, keep the order
+        if module.startswith(_EXCLUDE_MODULES) or \
+                module.lstrip('_').startswith(_EXCLUDE_MODULES) or \
+                _STDLIB_SCAN_IGNORE.match(module) or \
+                other_platform.match(module):
+            continue
+        args += ('--hidden-import', module)
+    for module in dict.fromkeys(platform_modules):
+        args += ('--exclude-module', module)
+    return tuple(args)
+
+
+def _stdlib_module_names() -> Iterable[str] | None:
+    """Returns the names of the top-level standard-library modules.
+
+    :return: The names, or :data:`None` if :data:`sys.stdlib_module_names`
+        does not exist and there is no bundled list for the running version
+        of Python.
+    """
+    names = getattr(sys, 'stdlib_module_names', None)
+    if names is not None:
+        return names
+
+    import json
+
+    major, minor = sys.version_info[:2]
+    path = os.path.join(_HERE, '_stdlib', f'py{major}{minor}.json')
+    try:
+        with open(path, mode='rt', encoding='utf-8') as fp:
+            return json.load(fp)
+    except OSError:
+        return None
+
+
+def _scan_stdlib_module_names() -> list[str]:
+    """Returns the names of the top-level modules in the standard-library directories.
+
+    Unlike :data:`sys.stdlib_module_names`, this only finds the modules that
+    are available on the running platform. This function was also used to
+    generate the bundled lists (together with the platform-specific names
+    from :data:`sys.stdlib_module_names` of a newer version of Python).
+    """
+    import sysconfig
+    from pkgutil import iter_modules
+
+    stdlib = sysconfig.get_path('stdlib')
+    platstdlib = sysconfig.get_path('platstdlib')
+    paths = [stdlib, platstdlib, os.path.join(platstdlib, 'lib-dynload')]
+    if constants.IS_WINDOWS:
+        paths.append(os.path.join(sys.base_prefix, 'DLLs'))
+
+    names = set(sys.builtin_module_names)
+    names.update(m.name for m in iter_modules(paths))
+    return sorted(n for n in names if not _STDLIB_SCAN_IGNORE.match(n))
+
+
+def _expand_stdlib_modules(names: Iterable[str]) -> tuple[list[str], list[str]]:
+    """Expand the top-level standard-library modules into their submodules.
+
+    A module that cannot be found by the running interpreter is platform
+    specific (e.g., ``winreg`` on Linux). The modules are located, but
+    not imported.
+
+    :param names: The names of the top-level modules.
+    :return: The (platform-specific, available) modules.
+    """
+    platform_modules, modules = [], []
+    for name in sorted(names):
+        spec = _find_spec(name)
+        if spec is None:
+            platform_modules.append(name)
+            continue
+        modules.append(name)
+        if spec.submodule_search_locations:
+            modules.extend(_iter_submodules(name, spec.submodule_search_locations))
+    return platform_modules, modules
+
+
+def _iter_submodules(package: str, paths: Iterable[str]) -> Iterator[str]:
+    """Yields the names of the public submodules of a package, recursively.
+
+    Private submodules (those that begin with an underscore) are imported by
+    their public parent and test packages are never required at runtime.
+
+    :param package: The name of the package.
+    :param paths: The directories to search for submodules in.
+    """
+    from pkgutil import iter_modules
+
+    for info in iter_modules(paths, prefix=f'{package}.'):
+        name = info.name.rpartition('.')[2]
+        if name.startswith('_') or name in ('test', 'tests', 'idle_test'):
+            continue
+        yield info.name
+        if info.ispkg:
+            path = os.path.join(getattr(info.module_finder, 'path', ''), name)
+            yield from _iter_submodules(info.name, [path])
+
+
+def _get_modindex_modules() -> tuple[list[str], list[str]]:
+    """Get the modules that are listed in the Python Module Index on docs.python.org.
+
+    :return: The (platform-specific, available) modules.
+    """
     # some modules are platform specific and got a
     #   RecursionError: maximum recursion depth exceeded
     # when running this script with PyInstaller 3.3 installed
     if constants.IS_WINDOWS:
-        os_ignore_list = ['(Unix)', '(Linux)', '(Linux, FreeBSD)']
+        os_ignore = ('(Unix)', '(Linux)', '(Linux, FreeBSD)')
     elif constants.IS_LINUX:
-        os_ignore_list = ['(Windows)']
+        os_ignore = ('(Windows)',)
     elif constants.IS_MAC:
-        os_ignore_list = ['(Windows)', '(Linux)', '(Linux, FreeBSD)']
+        os_ignore = ('(Windows)', '(Linux)', '(Linux, FreeBSD)')
     else:
-        os_ignore_list = []
+        os_ignore = ()
 
+    # a single regex search per module, rather than a substring search per note
+    os_ignore_regex = re.compile('|'.join(map(re.escape, os_ignore))) if os_ignore else None
+
+    platform_modules = []
     modules = []
-    url = f'https://docs.python.org/{sys.version_info.major}.{sys.version_info.minor}/py-modindex.html'
-    for s in urlopen(url).read().decode().split('#module-')[1:]:
-        m = s.split('"><code')
-        add_module = True
-        for x in os_ignore_list:
-            if x in m[1]:
-                ignore_list.append(m[0])
-                add_module = False
-                break
-        if add_module:
-            modules.append(m[0])
-
-    included_modules, excluded_modules = [], []
-    for module in modules:
-        include_module = True
-        for mod in ignore_list:
-            if module.startswith(mod):
-                excluded_modules.extend(['--exclude-module', module])
-                include_module = False
+    for module, availability in _load_modindex(sys.version_info.major, sys.version_info.minor):
+        if os_ignore_regex is not None and os_ignore_regex.search(availability):
+            platform_modules.append(module)
+        else:
+            modules.append(module)
+    return platform_modules, modules
+
+
+def _cache_dir() -> str:
+    """Returns the directory that msl-loadlib uses to cache files."""
+    if constants.IS_WINDOWS:
+        root = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    elif constants.IS_MAC:
+        root = os.path.join(os.path.expanduser('~'), 'Library', 'Caches')
+    else:
+        root = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(root, 'msl-loadlib')
+
+
+@lru_cache(maxsize=None)
+def _load_modindex(major: int, minor: int) -> tuple[tuple[str, str], ...]:
+    """Load the entries in the Python Module Index.
+
+    The entries are cached in :func:`_cache_dir` so that docs.python.org is
+    only requested if the cached entries do not exist or are older than
+    :data:`_MODINDEX_CACHE_TTL` seconds. Set the ``MSL_LOADLIB_REFRESH_MODINDEX``
+    environment variable to ``1`` to ignore the cached entries. Expired
+    entries are revalidated with a conditional request, so the page is only
+    downloaded again if it has changed, and they are still used if
+    docs.python.org cannot be reached.
+
+    :param major: The major version number of Python.
+    :param minor: The minor version number of Python.
+    :return: The (name, availability) of each module, e.g., ``('winreg', '(Windows)')``.
+        The availability is an empty string if the module is available on all platforms.
+    """
+    import json
+    import time
+
+    path = os.path.join(_cache_dir(), f'py-modindex-{major}.{minor}.json')
+    refresh = os.environ.get('MSL_LOADLIB_REFRESH_MODINDEX') == '1'
+    cached = None
+    etag = last_modified = ''
+    try:
+        mtime = os.path.getmtime(path)
+        with open(path, mode='rt', encoding='utf-8') as fp:
+            obj = json.load(fp)
+        cached = tuple((name, availability) for name, availability in obj['entries'])
+        if not refresh:
+            if time.time() - mtime < _MODINDEX_CACHE_TTL:
+                return cached
+            etag, last_modified = obj['etag'], obj['last_modified']
+    except (OSError, ValueError, TypeError, KeyError):
+        pass  # the cache does not exist or is corrupt
+
+    try:
+        entries, etag, last_modified = _fetch_modindex(
+            major, minor, etag=etag, last_modified=last_modified)
+    except OSError:
+        # e.g., no network connection, an expired cache is better than nothing
+        if cached is None:
+            raise
+        return cached
+
+    if entries is None:  # not modified, the cache is valid for another TTL period
+        entries = cached
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, mode='wt', encoding='utf-8') as fp:
+            json.dump({'etag': etag, 'last_modified': last_modified, 'entries': entries}, fp)
+    except OSError:
+        pass  # caching is an optimisation, freezing can still continue
+    return entries
+
+
+def _fetch_modindex(major: int,
+                    minor: int,
+                    *,
+                    etag: str = '',
+                    last_modified: str = '') -> tuple[tuple[tuple[str, str], ...] | None, str, str]:
+    """Fetch the entries in the Python Module Index from docs.python.org.
+
+    :param major: The major version number of Python.
+    :param minor: The minor version number of Python.
+    :param etag: The ``ETag`` of a previous response, to make a conditional request.
+    :param last_modified: The ``Last-Modified`` date of a previous response,
+        to make a conditional request.
+    :return: The (name, availability) of each module (or :data:`None` if the
+        page has not been modified) and the ``ETag`` and ``Last-Modified``
+        values of the response.
+    """
+    import gzip
+    import io
+    from urllib.error import HTTPError
+    from urllib.request import Request
+    from urllib.request import urlopen
+
+    url = f'https://docs.python.org/{major}.{minor}/py-modindex.html'
+    headers = {'Accept-Encoding': 'gzip'}
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+
+    try:
+        response = urlopen(Request(url, headers=headers))
+    except HTTPError as e:
+        if e.code == 304:
+            return None, etag, last_modified
+        raise
+
+    with response:
+        # decode the body as it is read, rather than keeping a bytes and a str copy
+        stream = response
+        if response.headers.get('Content-Encoding') == 'gzip':
+            stream = gzip.GzipFile(fileobj=response)
+        charset = response.headers.get_content_charset() or 'utf-8'
+        reader = io.TextIOWrapper(stream, encoding=charset)
+        parser = _modindex_parser()
+        while True:
+            chunk = reader.read(16384)
+            if not chunk:
                 break
-        if include_module:
-            included_modules.extend(['--hidden-import', module])
-    return included_modules + excluded_modules
+            parser.feed(chunk)
+        parser.close()
+        etag = response.headers.get('ETag') or ''
+        last_modified = response.headers.get('Last-Modified') or ''
+    return tuple(parser.entries), etag, last_modified
+
+
+def _modindex_parser() -> Any:
+    """Returns a parser for the modules in the Python Module Index.
+
+    :mod:`html.parser` is only imported if docs.python.org is requested.
+    """
+    from html.parser import HTMLParser
+
+    class ModIndexParser(HTMLParser):
+        """Parse the modules in the Python Module Index.
+
+        A row of the index is, for example::
+
+            <a href="library/winreg.html#module-winreg"><code class="xref">winreg</code></a> <em>(Windows)</em></td>
+
+        where the platform note, ``<em>(Windows)</em>``, is optional.
+        """
+
+        def __init__(self) -> None:
+            super().__init__()
+            self.entries: list[tuple[str, str]] = []
+            self._name: str | None = None
+            self._link_closed = False
+            self._in_em = False
+            self._availability = ''
+
+        def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+            if tag == 'a':
+                for key, value in attrs:
+                    if key == 'href' and value and '#module-' in value:
+                        self._name = value.partition('#module-')[2]
+                        self._link_closed = False
+                        self._availability = ''
+            elif tag == 'em' and self._link_closed:
+                self._in_em = True
+
+        def handle_endtag(self, tag: str) -> None:
+            if self._name is None:
+                return
+            if tag == 'a':
+                self._link_closed = True
+            elif tag == 'em':
+                self._in_em = False
+            elif tag == 'td' and self._link_closed:
+                self.entries.append((self._name, self._availability.strip()))
+                self._name = None
+                self._link_closed = False
+
+        def handle_data(self, data: str) -> None:
+            if self._in_em:
+                self._availability += data
+
+    return ModIndexParser()
 
 
 def _create_version_info_file(root_dir: str) -> str:
@@ -266,47 +1166,34 @@ def _create_version_info_file(root_dir: str) -> str:
     :param root_dir: The directory to save the version file to.
     :return: The filename of the version file.
     """
-    text = f"""# UTF-8
-#
-# For more details about fixed file info 'ffi' see:
-# https://docs.microsoft.com/en-us/windows/win32/api/verrsrc/ns-verrsrc-vs_fixedfileinfo
-# For language and charset parameters see:
-# https://docs.microsoft.com/en-us/windows/win32/menurc/stringfileinfo-block
-VSVersionInfo(
-  ffi=FixedFileInfo(
-    filevers=({version_info.major}, {version_info.minor}, {version_info.micro}, 0),
-    prodvers=({sys.version_info.major}, {sys.version_info.minor}, {sys.version_info.micro}, 0),
-    mask=0x3f,
-    flags=0x0,
-    OS=0x40004,
-    fileType=0x1,
-    subtype=0x0,
-    date=(0, 0)
-    ),
-  kids=[
-    StringFileInfo(
-      [
-      StringTable(
-        '000004B0',
-        [StringStruct('CompanyName', '{loadlib.__author__}'),
-        StringStruct('FileDescription', 'Access a 32-bit library from 64-bit Python'),
-        StringStruct('FileVersion', '{version_info.major}.{version_info.minor}.{version_info.micro}.0'),
-        StringStruct('InternalName', '{constants.SERVER_FILENAME}'),
-        StringStruct('LegalCopyright', '\xc2{loadlib.__copyright__}'),
-        StringStruct('OriginalFilename', '{constants.SERVER_FILENAME}'),
-        StringStruct('ProductName', 'Python'),
-        StringStruct('ProductVersion', '{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}.0')])
-      ]), 
-    VarFileInfo([VarStruct('Translation', [0, 1200])])
-  ]
-)
-"""
     filename = 'file_version_info.txt'
-    with open(os.path.join(root_dir, filename), mode='wt') as fp:
-        fp.write(text)
+    path = os.path.join(root_dir, filename)
+
+    # the work directory is reused between freezes, so write to a temporary
+    # file and then rename it to not leave a partially-written file behind
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, mode='wt', encoding='utf-8') as fp:
+        fp.write(_version_info_text())
+    os.replace(tmp_path, path)
     return filename
 
 
+@lru_cache(maxsize=1)
+def _version_info_text() -> str:
+    """Returns the contents of the version info file for Windows."""
+    return _VERSION_INFO_TEMPLATE.substitute(
+        major=version_info.major,
+        minor=version_info.minor,
+        micro=version_info.micro,
+        py_major=sys.version_info.major,
+        py_minor=sys.version_info.minor,
+        py_micro=sys.version_info.micro,
+        author=loadlib.__author__,
+        copyright=loadlib.__copyright__,
+        filename=constants.SERVER_FILENAME,
+    )
+
+
 def _cli() -> None:
     """Main entry point of the console script."""
     import argparse
@@ -358,6 +1245,35 @@ def _cli() -> None:
              'to create the server.'
     )
 
+    parser.add_argument(
+        '--no-strip',
+        action='store_true',
+        help='do not strip the symbol tables from the executable and\n'
+             'shared libraries of the server (Linux and macOS)'
+    )
+    parser.add_argument(
+        '--optimize',
+        type=int,
+        choices=(0, 1, 2),
+        default=0,
+        help='the optimization level to compile the modules of the\n'
+             'server with, 1 removes assert statements and 2 also\n'
+             'removes docstrings (requires PyInstaller >= 6.0)'
+    )
+    parser.add_argument(
+        '--onedir',
+        action='store_true',
+        help='create the server as a directory that contains the\n'
+             'executable, rather than as a single file (the server\n'
+             'starts faster)'
+    )
+    parser.add_argument(
+        '--fresh',
+        action='store_true',
+        help='ignore a previously-frozen server in the cache and\n'
+             'clean the PyInstaller work directory before freezing'
+    )
+
     args = parser.parse_args(sys.argv[1:])
 
     sys.exit(
@@ -367,5 +1283,9 @@ def _cli() -> None:
             imports=args.imports,
             data=args.data,
             skip_32bit_check=args.skip_32bit_check,
+            fresh=args.fresh,
+            strip=not args.no_strip,
+            optimize=args.optimize,
+            onefile=not args.onedir,
         )
     )
@@ -6,9 +6,11 @@ from __future__ import annotations
 import ctypes
 import ctypes.util
 import os
-import subprocess
 import sys
+from functools import lru_cache
+from itertools import chain
 from typing import Any
+from typing import Iterable
 from typing import Literal
 from typing import TYPE_CHECKING
 from typing import TypeVar
@@ -32,6 +34,26 @@ Self = TypeVar('Self', bound='LoadLibrary')
 PathLike = TypeVar('PathLike', str, bytes, os.PathLike)
 """A :term:`path-like object`."""
 
+# The ctypes class that loads each libtype (WinDLL and OleDLL only exist on Windows)
+_CTYPES_LOADERS: dict[str, type[ctypes.CDLL] | None] = {
+    'cdll': ctypes.CDLL,
+    'windll': getattr(ctypes, 'WinDLL', None),
+    'oledll': getattr(ctypes, 'OleDLL', None),
+}
+
+# The Java archive that starts the py4j.GatewayServer
+_PY4J_WRAPPER: str = os.path.join(os.path.dirname(__file__), 'py4j-wrapper.jar')
+
+# The Assembly and its System.Type objects, for each .NET library that was loaded
+_dotnet_types: dict[str, tuple[Any, Any]] = {}
+
+# The directories in sys.path and os.environ['PATH'] that were searched and
+# the path of the file that was found, for each filename
+_search_dirs_cache: dict[str, tuple[tuple[str, ...], str]] = {}
+
+# The handles of the libraries that were loaded by a ctypes class
+_handles: dict[tuple[Any, ...], int] = {}
+
 if IS_WINDOWS and not hasattr(sys, 'coinit_flags'):
     # https://pywinauto.readthedocs.io/en/latest/HowTo.html#com-threading-model
     # Configure comtypes for Multi-Threaded Apartment model (MTA)
@@ -59,6 +81,17 @@ class LoadLibrary:
         .. versionchanged:: 0.9
            Added support for ActiveX_ libraries.
 
+        .. attention::
+           If a `cdll`, `windll` or `oledll` library was already loaded by
+           :class:`LoadLibrary`, its handle is reused and the dynamic linker is not
+           called again, so the reference count of the library (that the operating
+           system keeps) is not incremented. If you unload the library (e.g., by
+           calling ``FreeLibrary`` or ``dlclose`` with its handle), the handle of
+           every other :class:`LoadLibrary` instance of the same file is no longer
+           valid and using it may crash the interpreter. Call :meth:`.clear_cache`
+           before you unload a library, so that it is loaded again by the dynamic
+           linker the next time, and do not use the other instances afterwards.
+
         .. _Assembly: https://docs.microsoft.com/en-us/dotnet/api/system.reflection.assembly
         .. _comtypes.CreateObject: https://pythonhosted.org/comtypes/#creating-and-accessing-com-objects
         .. _COM: https://en.wikipedia.org/wiki/Component_Object_Model
@@ -70,9 +103,11 @@ class LoadLibrary:
 
                 1. assume that a full or a relative (to the current working directory)
                    path is specified, then
-                2. use :func:`ctypes.util.find_library`, then
-                3. search :data:`sys.path`, then
-                4. search :data:`os.environ['PATH'] <os.environ>`.
+                2. if `path` is a filename and `libtype` is `cdll`, `windll` or `oledll`,
+                   let the dynamic linker search for the library, then
+                3. use :func:`ctypes.util.find_library`, then
+                4. search :data:`sys.path`, then
+                5. search :data:`os.environ['PATH'] <os.environ>`.
 
             If loading a COM_ library, `path` may either be the
 
@@ -130,7 +165,7 @@ class LoadLibrary:
 
         if libtype is None:
             # automatically determine the libtype
-            if path.endswith('.jar') or path.endswith('.class'):
+            if path.endswith(('.jar', '.class')):
                 libtype = 'java'
             else:
                 libtype = 'cdll'
@@ -155,29 +190,23 @@ class LoadLibrary:
         if libtype not in ['com', 'activex']:
             self._path = os.path.abspath(_path)
             if not os.path.isfile(self._path):
-                # for find_library use the original 'path' value since it may be a library name
-                # without any prefix like 'lib', suffix like '.so', '.dylib' or version number
-                self._path = ctypes.util.find_library(path)
-                if self._path is None:  # then search sys.path and os.environ['PATH']
-                    success = False
-                    search_dirs = sys.path + os.environ['PATH'].split(os.pathsep)
-                    for directory in search_dirs:
-                        p = os.path.join(directory, _path)
-                        if os.path.isfile(p):
-                            self._path = p
-                            success = True
-                            break
-                    if not success:
-                        raise OSError(f'Cannot find {path!r} for libtype={libtype!r}')
+                # trying the dynamic linker first avoids find_library, which
+                # may run ldconfig, gcc or objdump in a subprocess
+                self._lib = _load_from_linker_path(_path, libtype, **kwargs)
+                if self._lib is not None:
+                    self._path = _library_file(self._lib) or _path
+                else:
+                    self._path = _find_library_path(path, _path, libtype)
         else:
             self._path = _path
 
-        if libtype == 'cdll':
-            self._lib = ctypes.CDLL(self._path, **kwargs)
-        elif libtype == 'windll':
-            self._lib = ctypes.WinDLL(self._path, **kwargs)
-        elif libtype == 'oledll':
-            self._lib = ctypes.OleDLL(self._path, **kwargs)
+        if self._lib is not None:
+            pass  # the dynamic linker loaded the library while searching for it
+        elif libtype in _CTYPES_LOADERS:
+            loader = _CTYPES_LOADERS[libtype]
+            if loader is None:
+                raise OSError(f'Cannot load a library for libtype={libtype!r} on this operating system')
+            self._lib = _load_ctypes_library(loader, self._path, **kwargs)
         elif libtype == 'com':
             if not utils.is_comtypes_installed():
                 raise OSError(
@@ -210,35 +239,16 @@ class LoadLibrary:
                     'Run: pip install py4j'
                 )
 
+            import subprocess
             from py4j.version import __version__
-            from py4j.java_gateway import JavaGateway, GatewayParameters
 
             # the address and port to use to host the py4j.GatewayServer
             address = kwargs.pop('address', '127.0.0.1')
             port = kwargs.pop('port', utils.get_available_port())
 
-            # find the py4j*.jar file (needed to import the py4j.GatewayServer on the Java side)
-            filename = f'py4j{__version__}.jar'
-            py4j_jar = os.environ.get('PY4J_JAR', '')
-            if py4j_jar:
-                if not os.path.isfile(py4j_jar) or os.path.basename(py4j_jar) != filename:
-                    raise OSError(f'A PY4J_JAR environment variable exists, '
-                                  f'but the full path to {filename} is invalid\n'
-                                  f'PY4J_JAR={py4j_jar}')
-            else:
-                root = os.path.dirname(sys.executable)
-                for item in [root, os.path.dirname(root), os.path.join(os.path.expanduser('~'), '.local')]:
-                    py4j_jar = os.path.join(item, 'share', 'py4j', filename)
-                    if os.path.isfile(py4j_jar):
-                        break
-                if not os.path.isfile(py4j_jar):
-                    raise OSError(f'Cannot find {filename}\n'
-                                  f'Create a PY4J_JAR environment variable '
-                                  f'to be equal to the full path to {filename}')
-
             # build the java command
-            wrapper = os.path.join(os.path.dirname(__file__), 'py4j-wrapper.jar')
-            cmd = ['java', '-cp', f'{py4j_jar}{os.pathsep}{wrapper}', 'Py4JWrapper', str(port)]
+            py4j_jar = _find_py4j_jar(os.environ.get('PY4J_JAR', ''), f'py4j{__version__}.jar')
+            cmd = ['java', '-cp', f'{py4j_jar}{os.pathsep}{_PY4J_WRAPPER}', 'Py4JWrapper', str(port)]
 
             # from the URLClassLoader documentation:
             #   Any URL that ends with a '/' is assumed to refer to a directory. Otherwise, the URL
@@ -252,7 +262,8 @@ class LoadLibrary:
             try:
                 # start the py4j.GatewayServer
                 flags = 0x08000000 if IS_WINDOWS else 0  # fixes issue 31, CREATE_NO_WINDOW = 0x08000000
-                subprocess.Popen(cmd, stderr=subprocess.PIPE, stdout=subprocess.PIPE, creationflags=flags)
+                # the output is not read, a PIPE could fill up and block the JVM
+                subprocess.Popen(cmd, stderr=subprocess.DEVNULL, stdout=subprocess.DEVNULL, creationflags=flags)
             except OSError as e:
                 err = str(e).rstrip()
                 err += '\nYou must have a Java Runtime Environment installed and available on PATH'
@@ -260,6 +271,9 @@ class LoadLibrary:
             if err:
                 raise OSError(err)
 
+            # import while the JVM is starting
+            from py4j.java_gateway import JavaGateway, GatewayParameters
+
             try:
                 utils.wait_for_server(address, port, 10.0)
             except OSError as e:
@@ -286,9 +300,11 @@ class LoadLibrary:
             import System  # noqa: available once pythonnet is imported
             dotnet = {'System': System}
 
-            # the shared library must be available in sys.path
+            # the shared library must be available in sys.path (loading
+            # many libraries from the same directory must not grow sys.path)
             head, tail = os.path.split(self._path)
-            sys.path.insert(0, head)
+            if head not in sys.path:
+                sys.path.insert(0, head)
 
             try:
                 # don't include the library extension
@@ -333,28 +349,24 @@ class LoadLibrary:
                                       f'cannot load the library.\n{err}')
                 raise OSError('The above "System.IO.FileLoadException" is not handled.\n')
 
-            try:
-                types = self._assembly.GetTypes()
-            except Exception as e:
-                utils.logger.error(e)
-                utils.logger.error('The LoaderExceptions are:')
-                for item in e.LoaderExceptions:  # noqa: LoaderExceptions comes from .NET
-                    utils.logger.error('  %s', item.Message)
+            # Assembly.LoadFile returns the same Assembly every time that the same
+            # file is loaded, so the types from a previous load can be reused
+            cached = _dotnet_types.get(self._path)
+            if cached is not None and cached[0].Equals(self._assembly):
+                types = cached[1]
             else:
-                for t in types:
-                    try:
-                        if t.Namespace:
-                            obj = __import__(t.Namespace)
-                        else:
-                            obj = getattr(__import__('clr'), t.FullName)
-                    except:  # noqa: PEP 8: E722 do not use bare 'except'
-                        obj = t
-                        obj.__name__ = t.FullName
-
-                    if obj.__name__ not in dotnet:
-                        dotnet[obj.__name__] = obj
-
-            self._lib = DotNet(dotnet, self._path)
+                try:
+                    types = self._assembly.GetTypes()
+                except Exception as e:
+                    utils.logger.error(e)
+                    utils.logger.error('The LoaderExceptions are:')
+                    for item in e.LoaderExceptions:  # noqa: LoaderExceptions comes from .NET
+                        utils.logger.error('  %s', item.Message)
+                    types = ()
+                else:
+                    _dotnet_types[self._path] = (self._assembly, types)
+
+            self._lib = DotNet(dotnet, self._path, types)
 
         else:
             assert False, 'Should not get here -- contact developers'
@@ -403,6 +415,23 @@ class LoadLibrary:
             self._app = None
             utils.logger.debug('close ActiveX application')
 
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Clear the information that is cached about the libraries that were loaded.
+
+        The libraries are not unloaded. The next time that a library is loaded,
+        the library is searched for and the dynamic linker (or the .NET Runtime)
+        is called again. Call this method before you unload a `cdll`, `windll`
+        or `oledll` library, since a cached handle would no longer be valid.
+
+        .. versionadded:: 1.0
+        """
+        _handles.clear()
+        _dotnet_types.clear()
+        _search_dirs_cache.clear()
+        _find_library.cache_clear()
+        _find_py4j_jar.cache_clear()
+
     @property
     def assembly(self) -> Any:
         """
@@ -442,25 +471,259 @@ class LoadLibrary:
 
     @property
     def path(self) -> str:
-        """The path to the shared library file."""
+        """The path to the shared library file.
+
+        .. versionchanged:: 1.0
+           If the dynamic linker found the library, this is the path of the file
+           that the dynamic linker loaded (on Windows, Linux, FreeBSD and macOS).
+           If the path cannot be determined, this is the filename of the library.
+        """
         return self._path
 
 
+@lru_cache(maxsize=8)
+def _find_py4j_jar(py4j_jar: str, filename: str) -> str:
+    """Find the py4j*.jar file (needed to import the py4j.GatewayServer on the Java side).
+
+    The path is only searched for the first time that a Java library is
+    loaded (an :exc:`OSError` is not cached).
+
+    :param py4j_jar: The value of the PY4J_JAR environment variable.
+    :param filename: The filename of the py4j*.jar file.
+    :return: The path to the py4j*.jar file.
+    :raises OSError: If the file cannot be found.
+    """
+    if py4j_jar:
+        if not os.path.isfile(py4j_jar) or os.path.basename(py4j_jar) != filename:
+            raise OSError(f'A PY4J_JAR environment variable exists, '
+                          f'but the full path to {filename} is invalid\n'
+                          f'PY4J_JAR={py4j_jar}')
+        return py4j_jar
+
+    root = os.path.dirname(sys.executable)
+    for item in [root, os.path.dirname(root), os.path.join(os.path.expanduser('~'), '.local')]:
+        py4j_jar = os.path.join(item, 'share', 'py4j', filename)
+        if os.path.isfile(py4j_jar):
+            return py4j_jar
+
+    raise OSError(f'Cannot find {filename}\n'
+                  f'Create a PY4J_JAR environment variable '
+                  f'to be equal to the full path to {filename}')
+
+
+def _find_library_path(path: str, filename: str, libtype: str) -> str:
+    """Find a library that is not located relative to the current working directory.
+
+    :param path: The path that was passed to :class:`LoadLibrary`.
+    :param filename: The value of `path` with the default extension appended
+        (if `path` does not have an extension).
+    :param libtype: The library type.
+    :return: The path to the library.
+    :raises OSError: If the library cannot be found.
+    """
+    # for find_library use the original 'path' value since it may be a library name
+    # without any prefix like 'lib', suffix like '.so', '.dylib' or version number
+    found = _find_library(path)
+    if found is not None:
+        return found
+
+    # then search sys.path and os.environ['PATH'], a directory that is in both
+    # (or that is repeated) only needs to be checked once
+    search_dirs = tuple(dict.fromkeys(chain(sys.path, os.environ.get('PATH', '').split(os.pathsep))))
+
+    # the file that was found the last time that the same directories were
+    # searched is checked first, so that loading the same library again
+    # requires one stat() call instead of one for each directory
+    cached = _search_dirs_cache.get(filename)
+    if cached is not None and cached[0] == search_dirs and os.path.isfile(cached[1]):
+        return cached[1]
+
+    for directory in search_dirs:
+        p = os.path.join(directory, filename)
+        if os.path.isfile(p):
+            _search_dirs_cache[filename] = (search_dirs, p)
+            return p
+
+    raise OSError(f'Cannot find {path!r} for libtype={libtype!r}')
+
+
+@lru_cache(maxsize=1024)
+def _find_library(name: str) -> str | None:
+    """Cached version of :func:`ctypes.util.find_library`.
+
+    On Linux, :func:`ctypes.util.find_library` may run ldconfig, gcc or objdump
+    in a subprocess and the result does not change while Python is running.
+
+    :param name: The name of the library.
+    :return: The path to the library or :data:`None` if the library cannot be found.
+    """
+    return ctypes.util.find_library(name)
+
+
+def _load_from_linker_path(name: str, libtype: str, **kwargs: Any) -> ctypes.CDLL | None:
+    """Load a library, that is specified by its filename, from the search path of the dynamic linker.
+
+    :param name: The filename of the library.
+    :param libtype: The library type.
+    :param kwargs: The keyword arguments to pass to the ctypes class that loads the library.
+    :return: The loaded library or :data:`None` if the dynamic linker cannot load
+        `name` (or if `name` is not a filename of a `cdll`, `windll` or `oledll` library).
+    """
+    if os.path.dirname(name):
+        return None
+
+    loader = _CTYPES_LOADERS.get(libtype)
+    if loader is None:
+        return None
+
+    try:
+        return _load_ctypes_library(loader, name, **kwargs)
+    except OSError:
+        return None
+
+
+def _library_file(lib: ctypes.CDLL) -> str | None:
+    """Returns the path of the file that the dynamic linker loaded for a library.
+
+    :param lib: The library.
+    :return: The path or :data:`None` if the path cannot be determined.
+    """
+    if IS_WINDOWS:
+        buffer = ctypes.create_unicode_buffer(32768)
+        n = ctypes.windll.kernel32.GetModuleFileNameW(ctypes.c_void_p(lib._handle), buffer, len(buffer))
+        return buffer.value if n else None
+
+    dl = ctypes.CDLL(None)
+
+    # dlinfo(RTLD_DI_LINKMAP) is available on Linux (glibc and musl) and FreeBSD
+    if hasattr(dl, 'dlinfo'):
+        class LinkMap(ctypes.Structure):
+            _fields_ = [('l_addr', ctypes.c_void_p), ('l_name', ctypes.c_char_p)]
+
+        link_map = ctypes.POINTER(LinkMap)()
+        if dl.dlinfo(ctypes.c_void_p(lib._handle), 2, ctypes.byref(link_map)) != 0:
+            return None
+        name = link_map.contents.l_name
+        return os.fsdecode(name) if name else None
+
+    # macOS does not have dlinfo, find the image (that dyld has loaded) that
+    # dlopen returns the same handle for, without loading a new image
+    if hasattr(dl, '_dyld_image_count'):
+        dl._dyld_get_image_name.restype = ctypes.c_char_p
+        dl._dyld_get_image_name.argtypes = [ctypes.c_uint32]
+        dl.dlopen.restype = ctypes.c_void_p
+        dl.dlopen.argtypes = [ctypes.c_char_p, ctypes.c_int]
+        dl.dlclose.argtypes = [ctypes.c_void_p]
+        mode = getattr(os, 'RTLD_NOLOAD', 0x10) | getattr(os, 'RTLD_LAZY', 0x1)
+        for i in range(dl._dyld_image_count()):
+            name = dl._dyld_get_image_name(i)
+            if not name:
+                continue
+            handle = dl.dlopen(name, mode)
+            if handle:
+                dl.dlclose(handle)  # dlopen incremented the reference count
+                if handle == lib._handle:
+                    return os.fsdecode(name)
+
+    return None
+
+
+def _load_ctypes_library(loader: type[ctypes.CDLL], path: str, **kwargs: Any) -> ctypes.CDLL:
+    """Load a library with a ctypes class.
+
+    The handle of a library that was already loaded is passed to the ctypes
+    class, so that the dynamic linker is not called again. A new ctypes
+    object is still created, so that the `argtypes` and `restype` of the
+    functions are not shared between :class:`LoadLibrary` instances.
+
+    :param loader: The ctypes class, e.g., :class:`~ctypes.CDLL`.
+    :param path: The path to the library.
+    :param kwargs: The keyword arguments to pass to `loader`.
+    :return: The loaded library.
+    """
+    handle = kwargs.pop('handle', None)
+    if handle is not None:
+        return loader(path, handle=handle, **kwargs)
+
+    # a library that is specified by a relative path or by a symbolic link is the
+    # same library as the file that it resolves to, a filename (without a
+    # directory) is resolved by the dynamic linker and must be used as is
+    name = os.path.realpath(path) if os.path.dirname(path) else path
+
+    # the mode (POSIX) and winmode (Windows) change how the library is loaded
+    key = (loader, name, kwargs.get('mode'), kwargs.get('winmode'))
+    lib = loader(path, handle=_handles.get(key), **kwargs)
+    _handles[key] = lib._handle
+    return lib
+
+
 class DotNet:
 
-    def __init__(self, items: dict, path: str) -> None:
+    def __init__(self, items: dict, path: str, types: Iterable[Any] = ()) -> None:
         """Contains the namespace_ modules, classes and `System.Type`_ objects of a .NET Assembly.
 
         Do not instantiate this class directly.
 
+        .. versionchanged:: 1.0
+           Added the `types` argument. A namespace module (or class) is imported
+           the first time that it is accessed as an attribute.
+
         .. _namespace: https://msdn.microsoft.com/en-us/library/z2kcy19k.aspx
         .. _System.Type: https://docs.microsoft.com/en-us/dotnet/api/system.type
 
         :param items: The items to use to update the internal __dict__ attribute.
         :param path: The path to the .NET library file.
+        :param types: The `System.Type`_ objects in the .NET Assembly.
         """
         self.__dict__.update(items)
         self._path = path
 
+        # the types that have not been imported, grouped by the attribute
+        # name that the namespace module (or class) is expected to have
+        self._types: dict[str, list[Any]] = {}
+        for t in types:
+            namespace = t.Namespace
+            name = namespace.split('.')[0] if namespace else t.FullName
+            if name not in self.__dict__:
+                self._types.setdefault(name, []).append(t)
+
+    def __dir__(self) -> Iterable[str]:
+        return [*super().__dir__(), *self.__dict__.get('_types', ())]
+
+    def __getattr__(self, name: str) -> Any:
+        # only called if `name` is not in __dict__
+        types = self.__dict__.get('_types')
+        if types and not (name.startswith('__') and name.endswith('__')):
+            if name in types:
+                self._import(types.pop(name))
+            else:
+                # a type that cannot be imported is an attribute with
+                # the full name of the type, import all remaining types
+                while types:
+                    self._import(types.pop(next(iter(types))))
+            if name in self.__dict__:
+                return self.__dict__[name]
+        raise AttributeError(f'{self.__class__.__name__!r} object has no attribute {name!r}')
+
     def __repr__(self) -> str:
         return f'<{self.__class__.__name__} path={self._path}>'
+
+    def _import(self, types: Iterable[Any]) -> None:
+        """Import the namespace modules (or classes) of the `System.Type`_ objects."""
+        imported = set()
+        for t in types:
+            namespace = t.Namespace
+            if namespace in imported:
+                continue
+            try:
+                if namespace:
+                    obj = __import__(namespace)
+                    imported.add(namespace)
+                else:
+                    obj = getattr(__import__('clr'), t.FullName)
+            except:  # noqa: PEP 8: E722 do not use bare 'except'
+                obj = t
+                obj.__name__ = t.FullName
+
+            if obj.__name__ not in self.__dict__:
+                self.__dict__[obj.__name__] = obj
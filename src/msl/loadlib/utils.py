@@ -6,11 +6,9 @@ from __future__ import annotations
 import logging
 import os
 import socket
-import subprocess
 import time
 from types import ModuleType
 from typing import Any
-from xml.etree import ElementTree
 
 try:
     import winreg
@@ -112,6 +110,7 @@ def check_dot_net_config(py_exe_path: str) -> tuple[int, str]:
     config_path = f'{py_exe_path}.config'
 
     if os.path.isfile(config_path):
+        from xml.etree import ElementTree
 
         try:
             tree = ElementTree.parse(config_path)
@@ -185,6 +184,8 @@ def is_port_in_use(port: int) -> bool:
     :param port: The port number to test.
     :return: Whether the TCP port is in use.
     """
+    import subprocess
+
     flags = 0
     if IS_WINDOWS:
         flags = 0x08000000  # fixes issue 31, CREATE_NO_WINDOW = 0x08000000
@@ -211,20 +212,35 @@ def get_available_port() -> int:
 def wait_for_server(host: str, port: int, timeout: float) -> None:
     """Wait for the 32-bit server to start.
 
+    .. versionchanged:: 1.0
+       Connect to the server, with an exponential backoff between attempts,
+       instead of running a subprocess to check whether the port is in use.
+
     :param host: The hostname or IP address of the server.
     :param port: The port number of the server.
     :param timeout: The maximum number of seconds to wait to establish a connection to the server.
     :raises ConnectionTimeoutError: If a timeout occurred.
     """
-    stop = time.time() + max(0.0, timeout)
+    stop = time.monotonic() + max(0.0, timeout)
+    delay = 0.005
     while True:
-        if is_port_in_use(port):
-            return
+        # a short timeout for each attempt because, on Windows, a refused
+        # connection to the local host is only reported after retrying
+        remaining = stop - time.monotonic()
+        try:
+            with socket.create_connection((host, port), timeout=min(max(remaining, 0.01), 0.1)):
+                return
+        except OSError:
+            pass
 
-        if time.time() > stop:
+        remaining = stop - time.monotonic()
+        if remaining <= 0:
             raise ConnectionTimeoutError(f'Timeout after {timeout:.1f} second(s). '
                                          f'Could not connect to {host}:{port}')
 
+        time.sleep(min(delay, remaining))
+        delay = min(2.0 * delay, 0.08)
+
 
 def get_com_info(*additional_keys: str) -> dict[str, dict[str, str | None]]:
     """Reads the registry for the COM_ libraries that are available.
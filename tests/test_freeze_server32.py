@@ -0,0 +1,677 @@
+import gzip
+import importlib.metadata
+import json
+import io
+import os
+import subprocess
+import sys
+import threading
+import types
+import urllib.error
+from email.message import Message
+from importlib.machinery import ModuleSpec
+
+import pytest
+
+from msl.loadlib import constants
+from msl.loadlib import freeze_server32
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(monkeypatch, tmp_path_factory):
+    # do not write to the cache directory of the user
+    path = str(tmp_path_factory.mktemp('cache'))
+    monkeypatch.setattr(freeze_server32, '_cache_dir', lambda: path)
+    return path
+
+
+@pytest.mark.parametrize(
+    'item, expected',
+    [('mydata', ('mydata', '.')),
+     ('mydata:', ('mydata', '.')),
+     ('mydata/lib1.dll', ('mydata/lib1.dll', '.')),
+     ('mydata/bin/lib2.dll:bin', ('mydata/bin/lib2.dll', 'bin')),
+     ('mypackage/lib32.dll:mypackage', ('mypackage/lib32.dll', 'mypackage'))])
+def test_split_data_spec(item, expected):
+    assert freeze_server32._split_data_spec(item) == expected
+
+
+@pytest.mark.parametrize(
+    'item, expected',
+    [(r'C:\mydata', (r'C:\mydata', '.')),
+     (r'C:\mydata:', (r'C:\mydata', '.')),
+     (r'C:\mydata\lib2.dll:bin', (r'C:\mydata\lib2.dll', 'bin')),
+     (r'mydata\lib2.dll:bin', (r'mydata\lib2.dll', 'bin'))])
+def test_split_data_spec_windows(monkeypatch, item, expected):
+    monkeypatch.setattr(constants, 'IS_WINDOWS', True)
+    assert freeze_server32._split_data_spec(item) == expected
+
+
+MODINDEX_HTML = b"""<table class="indextable modindextable">
+   <tr class="pcap"><td></td><td>&#160;</td><td></td></tr>
+   <tr class="cap" id="cap-a"><td></td><td><strong>a</strong></td><td></td></tr>
+   <tr>
+     <td></td>
+     <td>
+     <a href="library/abc.html#module-abc"><code class="xref">abc</code></a></td><td>
+     <em>Abstract base classes according to :pep:`3119`.</em></td></tr>
+   <tr class="cap" id="cap-w"><td></td><td><strong>w</strong></td><td></td></tr>
+   <tr>
+     <td></td>
+     <td>
+     <a href="library/winreg.html#module-winreg"><code class="xref">winreg</code></a> <em>(Windows)</em></td><td>
+     <em>Routines and objects for manipulating the Windows registry.</em></td></tr>
+   <tr class="cg-1">
+     <td></td>
+     <td>&#160;&#160;&#160;
+     <a href="library/xml.etree.elementtree.html#module-xml.etree.ElementTree"><code class="xref">xml.etree.ElementTree</code></a></td><td>
+     <em>Implementation of the ElementTree API.</em></td></tr>
+</table>
+"""
+
+MODINDEX_ENTRIES = (
+    ('abc', ''),
+    ('winreg', '(Windows)'),
+    ('xml.etree.ElementTree', ''),
+)
+
+
+class FakeResponse(io.BytesIO):
+
+    def __init__(self, body, **headers):
+        super().__init__(body)
+        self.headers = Message()
+        self.headers['Content-Type'] = 'text/html; charset=utf-8'
+        for key, value in headers.items():
+            self.headers[key.replace('_', '-')] = value
+
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_fetch_modindex(monkeypatch, compress):
+    requests = []
+
+    def urlopen(request):
+        requests.append(request)
+        if compress:
+            return FakeResponse(gzip.compress(MODINDEX_HTML), Content_Encoding='gzip', ETag='"v1"')
+        return FakeResponse(MODINDEX_HTML, ETag='"v1"')
+
+    monkeypatch.setattr('urllib.request.urlopen', urlopen)
+    assert freeze_server32._fetch_modindex(3, 11) == (MODINDEX_ENTRIES, '"v1"', '')
+    assert len(requests) == 1
+    assert requests[0].full_url == 'https://docs.python.org/3.11/py-modindex.html'
+    assert requests[0].get_header('Accept-encoding') == 'gzip'
+    assert requests[0].get_header('If-none-match') is None
+
+
+def test_fetch_modindex_not_modified(monkeypatch):
+    requests = []
+
+    def urlopen(request):
+        requests.append(request)
+        raise urllib.error.HTTPError(request.full_url, 304, 'Not Modified', Message(), None)
+
+    monkeypatch.setattr('urllib.request.urlopen', urlopen)
+    date = 'Mon, 01 Jan 2024 00:00:00 GMT'
+    assert freeze_server32._fetch_modindex(3, 11, etag='"v1"', last_modified=date) == (None, '"v1"', date)
+    assert requests[0].get_header('If-none-match') == '"v1"'
+    assert requests[0].get_header('If-modified-since') == date
+
+
+def test_load_modindex_cache(monkeypatch, tmp_path):
+    fetched = []
+
+    def fetch_modindex(major, minor, *, etag='', last_modified=''):
+        fetched.append((major, minor))
+        if etag == '"v1"':
+            return None, etag, last_modified
+        return MODINDEX_ENTRIES, '"v1"', ''
+
+    monkeypatch.setattr(freeze_server32, '_cache_dir', lambda: str(tmp_path))
+    monkeypatch.setattr(freeze_server32, '_fetch_modindex', fetch_modindex)
+    freeze_server32._load_modindex.cache_clear()
+
+    assert freeze_server32._load_modindex(3, 11) == MODINDEX_ENTRIES
+    assert (tmp_path / 'py-modindex-3.11.json').is_file()
+    assert fetched == [(3, 11)]
+
+    # loaded from the cache file, not fetched again
+    freeze_server32._load_modindex.cache_clear()
+    assert freeze_server32._load_modindex(3, 11) == MODINDEX_ENTRIES
+    assert fetched == [(3, 11)]
+
+    # an expired cache is revalidated and renewed if it was not modified
+    path = tmp_path / 'py-modindex-3.11.json'
+    os.utime(path, (0, 0))
+    freeze_server32._load_modindex.cache_clear()
+    assert freeze_server32._load_modindex(3, 11) == MODINDEX_ENTRIES
+    assert fetched == [(3, 11), (3, 11)]
+    assert path.stat().st_mtime > 0
+
+    # force a refresh
+    monkeypatch.setenv('MSL_LOADLIB_REFRESH_MODINDEX', '1')
+    freeze_server32._load_modindex.cache_clear()
+    assert freeze_server32._load_modindex(3, 11) == MODINDEX_ENTRIES
+    assert fetched == [(3, 11), (3, 11), (3, 11)]
+
+    freeze_server32._load_modindex.cache_clear()
+
+
+def test_stdlib_module_names():
+    names = freeze_server32._stdlib_module_names()
+    assert 'os' in names
+    assert 'json' in names
+    assert 'winreg' in names
+
+
+def test_stdlib_module_names_bundled(monkeypatch):
+    monkeypatch.delattr(sys, 'stdlib_module_names', raising=False)
+    monkeypatch.setattr(sys, 'version_info', (3, 9, 0))
+    names = freeze_server32._stdlib_module_names()
+    assert 'os' in names
+    assert 'winreg' in names
+
+    monkeypatch.setattr(sys, 'version_info', (3, 7, 0))
+    assert freeze_server32._stdlib_module_names() is None
+
+
+def test_expand_stdlib_modules():
+    platform, modules = freeze_server32._expand_stdlib_modules(['json', 'os', 'xml', 'not_a_module'])
+    assert platform == ['not_a_module']
+    assert 'json' in modules
+    assert 'json.decoder' in modules
+    assert 'os' in modules
+    assert 'xml.etree.ElementTree' in modules
+    assert not any(m.rpartition('.')[2].startswith('_') for m in modules)
+
+
+def test_get_modindex_modules(monkeypatch):
+    monkeypatch.setattr(freeze_server32, '_load_modindex', lambda major, minor: MODINDEX_ENTRIES)
+    monkeypatch.setattr(constants, 'IS_WINDOWS', False)
+    monkeypatch.setattr(constants, 'IS_LINUX', True)
+    assert freeze_server32._get_modindex_modules() == (['winreg'], ['abc', 'xml.etree.ElementTree'])
+
+    monkeypatch.setattr(constants, 'IS_WINDOWS', True)
+    monkeypatch.setattr(constants, 'IS_LINUX', False)
+    assert freeze_server32._get_modindex_modules() == ([], ['abc', 'winreg', 'xml.etree.ElementTree'])
+
+
+def test_get_standard_modules_excluded(monkeypatch, tmp_path):
+    monkeypatch.setattr(freeze_server32, '_cache_dir', lambda: str(tmp_path))
+    monkeypatch.setattr(freeze_server32, '_stdlib_module_names', lambda: ['json', 'tkinter', 'turtle', 'turtledemo', 'json'])
+    freeze_server32._get_standard_modules.cache_clear()
+    modules = freeze_server32._get_standard_modules()
+    freeze_server32._get_standard_modules.cache_clear()
+    assert '--hidden-import' in modules
+    assert modules.count('json') == 1
+    for name in modules:
+        assert not name.startswith(('tkinter', 'turtle'))
+
+
+@pytest.mark.parametrize('is_windows', [False, True])
+def test_module_args(monkeypatch, is_windows):
+    monkeypatch.setattr(constants, 'IS_WINDOWS', is_windows)
+    modules = ['json', 'tkinter', 'tkinter.ttk', '_tkinter', '_testcapi', '_ctypes_test',
+               'test.support', 'this', 'antigravity', 'textwrap', 'threading',
+               'asyncio.windows_events', 'asyncio.windows_utils', 'asyncio.unix_events',
+               'ctypes.wintypes', 'encodings.mbcs', 'encodings.utf_8',
+               'multiprocessing.popen_spawn_win32', 'multiprocessing.popen_fork']
+    args = freeze_server32._module_args(['winreg'], modules)
+    assert args[-2:] == ('--exclude-module', 'winreg')
+    included = args[1:-2:2]
+    assert '_tkinter' not in included
+    if is_windows:
+        assert included == ('json', 'textwrap', 'threading', 'asyncio.windows_events',
+                            'asyncio.windows_utils', 'ctypes.wintypes', 'encodings.mbcs',
+                            'encodings.utf_8', 'multiprocessing.popen_spawn_win32')
+    else:
+        assert included == ('json', 'textwrap', 'threading', 'asyncio.unix_events',
+                            'encodings.utf_8', 'multiprocessing.popen_fork')
+
+
+@pytest.fixture
+def fake_pyinstaller(monkeypatch):
+    calls = []
+
+    def run(args):
+        # create the server in the same location that PyInstaller does
+        calls.append(args)
+        path = os.path.join(args[args.index('--distpath') + 1], constants.SERVER_FILENAME)
+        if '--onedir' in args:
+            path = os.path.join(path, constants.SERVER_FILENAME)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, mode='wb') as fp:
+            fp.write(b'server')
+
+    pyinstaller = types.ModuleType('PyInstaller')
+    pyinstaller.__spec__ = ModuleSpec('PyInstaller', None)
+    pyinstaller.__version__ = '6.0.0'
+    pyinstaller_main = types.ModuleType('PyInstaller.__main__')
+    pyinstaller_main.run = run
+    pyinstaller.__main__ = pyinstaller_main
+    monkeypatch.setitem(sys.modules, 'PyInstaller', pyinstaller)
+    monkeypatch.setitem(sys.modules, 'PyInstaller.__main__', pyinstaller_main)
+    return calls
+
+
+def test_main_in_process(fake_pyinstaller, tmp_path):
+    assert freeze_server32.main(spec='server.spec', dest=str(tmp_path), skip_32bit_check=True) == 0
+    assert len(fake_pyinstaller) == 1
+    args = fake_pyinstaller[0]
+    assert args[:2] == ['--distpath', str(tmp_path)]
+    assert args[-1] == os.path.abspath('server.spec')
+
+
+def test_main_use_subprocess(fake_pyinstaller, monkeypatch, tmp_path):
+    commands = []
+    monkeypatch.setattr(constants, 'IS_WINDOWS', True)
+    monkeypatch.setattr('subprocess.check_call', commands.append)
+    assert freeze_server32.main(spec='server.spec', dest=str(tmp_path),
+                                skip_32bit_check=True, use_subprocess=True) == 0
+    assert not fake_pyinstaller
+    assert len(commands) == 1
+    assert commands[0][:3] == [sys.executable, '-m', 'PyInstaller']
+    assert commands[0][-1] == os.path.abspath('server.spec')
+
+
+def test_run_pyinstaller_subprocess_pool(monkeypatch):
+    import multiprocessing
+
+    calls = []
+
+    class Pool:
+        def __init__(self, processes):
+            calls.append(('init', processes))
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *ignore):
+            calls.append(('exit',))
+
+        def apply(self, func, args):
+            calls.append(('apply', func, args))
+
+    monkeypatch.setattr(constants, 'IS_WINDOWS', False)
+    context = types.SimpleNamespace(Pool=Pool, set_forkserver_preload=lambda names: calls.append(('preload', names)))
+    monkeypatch.setattr(multiprocessing, 'get_context', lambda method: context)
+    freeze_server32._run_pyinstaller_subprocess(['server.spec'])
+
+    # PyInstaller is preloaded and the worker process does not outlive the freeze
+    assert calls == [('preload', ['PyInstaller.__main__']), ('init', 1),
+                     ('apply', freeze_server32._run_pyinstaller, (['server.spec'],)), ('exit',)]
+
+
+def test_run_pyinstaller_system_exit(fake_pyinstaller, monkeypatch):
+    def run(args):
+        raise SystemExit(code)
+
+    monkeypatch.setattr(sys.modules['PyInstaller.__main__'], 'run', run)
+
+    code = 0
+    freeze_server32._run_pyinstaller(['server.spec'])
+
+    code = None
+    freeze_server32._run_pyinstaller(['server.spec'])
+
+    code = 2
+    with pytest.raises(subprocess.CalledProcessError) as e:
+        freeze_server32._run_pyinstaller(['server.spec'])
+    assert e.value.returncode == 2
+
+
+def test_run_pyinstaller_system_exit_message(fake_pyinstaller, monkeypatch, capsys):
+    def run(args):
+        raise SystemExit('Spec file "server.spec" not found!')
+
+    monkeypatch.setattr(sys.modules['PyInstaller.__main__'], 'run', run)
+
+    with pytest.raises(subprocess.CalledProcessError) as e:
+        freeze_server32._run_pyinstaller(['server.spec'])
+    assert e.value.returncode == 1
+    assert 'returned non-zero exit status 1' in str(e.value)
+    assert capsys.readouterr().err == 'Spec file "server.spec" not found!\n'
+
+
+def test_resolve_data_item(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'mydata').mkdir()
+    (tmp_path / 'lib1.dll').touch()
+
+    mydata = str(tmp_path / 'mydata')
+    lib1 = str(tmp_path / 'lib1.dll')
+    assert freeze_server32._resolve_data_item('mydata', ':') == f'{mydata}:.'
+    assert freeze_server32._resolve_data_item('lib1.dll:bin', ';') == f'{lib1};bin'
+
+    with pytest.raises(OSError) as e:
+        freeze_server32._resolve_data_item('missing:bin', ':')
+    assert e.value.filename == str(tmp_path / 'missing')
+
+
+def test_add_data_sep():
+    assert freeze_server32._add_data_sep('5.13.2') == os.pathsep
+    assert freeze_server32._add_data_sep('6.0.0') == ':'
+    assert freeze_server32._add_data_sep('6.3.0.dev0') == ':'
+
+
+def test_main_imports_not_executed(fake_pyinstaller, monkeypatch, tmp_path, capsys):
+    monkeypatch.setattr(freeze_server32, '_get_standard_modules', lambda: ())
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'my_module.py').write_text('raise RuntimeError("must not be executed")\n')
+    monkeypatch.delitem(sys.modules, 'my_module', raising=False)
+
+    assert freeze_server32.main(imports='my_module', dest=str(tmp_path), skip_32bit_check=True) == 0
+    assert 'my_module' not in sys.modules
+    assert str(tmp_path) not in sys.path
+    args = fake_pyinstaller[0]
+    assert args[args.index('--paths') + 1] == str(tmp_path)
+    assert args[args.index('my_module') - 1] == '--hidden-import'
+
+    assert freeze_server32.main(imports=['my_module', 'not_a_module'],
+                                dest=str(tmp_path), skip_32bit_check=True) is None
+    assert 'not_a_module' in capsys.readouterr().err
+
+
+def test_main_cached(fake_pyinstaller, monkeypatch, tmp_path):
+    monkeypatch.setattr(freeze_server32, '_get_standard_modules', lambda: ())
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'mydata.txt').write_text('1')
+
+    def freeze(dest, **kwargs):
+        kwargs.setdefault('data', 'mydata.txt')
+        return freeze_server32.main(dest=str(tmp_path / dest), skip_32bit_check=True, **kwargs)
+
+    assert freeze('a') == 0
+    assert len(fake_pyinstaller) == 1
+
+    # the server is copied from the cache
+    assert freeze('b') == 0
+    assert len(fake_pyinstaller) == 1
+    assert (tmp_path / 'b' / constants.SERVER_FILENAME).read_bytes() == b'server'
+
+    assert freeze('c', fresh=True) == 0
+    assert len(fake_pyinstaller) == 2
+
+    # PyInstaller reuses its work directory, unless fresh=True
+    assert '--clean' not in fake_pyinstaller[0]
+    assert '--clean' in fake_pyinstaller[1]
+    def work_path(args):
+        return args[args.index('--workpath') + 1]
+
+    assert work_path(fake_pyinstaller[0]).startswith(freeze_server32._cache_dir())
+
+    # the work directory is shared by the destinations and is locked while PyInstaller runs
+    assert work_path(fake_pyinstaller[0]) == work_path(fake_pyinstaller[1])
+    assert os.path.isfile(work_path(fake_pyinstaller[0]) + '.lock')
+
+    # the contents of a data file is part of the key
+    (tmp_path / 'mydata.txt').write_text('2')
+    assert freeze('d') == 0
+    assert len(fake_pyinstaller) == 3
+
+    assert freeze('e', data='mydata.txt:bin') == 0
+    assert len(fake_pyinstaller) == 4
+
+    # stripping is part of the key
+    assert freeze('f', data='mydata.txt:bin', strip=False) == 0
+    assert len(fake_pyinstaller) == 5
+    assert '--strip' not in fake_pyinstaller[4]
+    assert ('--strip' in fake_pyinstaller[3]) is not constants.IS_WINDOWS
+    assert '--onefile' in fake_pyinstaller[4]
+    assert '--noupx' in fake_pyinstaller[0]
+
+
+def test_main_generators(fake_pyinstaller, monkeypatch, tmp_path):
+    monkeypatch.setattr(freeze_server32, '_get_standard_modules', lambda: ())
+    monkeypatch.chdir(tmp_path)
+    for name in ('a.txt', 'b.txt'):
+        (tmp_path / name).write_text(name)
+
+    assert freeze_server32.main(dest=str(tmp_path / 'a'), skip_32bit_check=True,
+                                imports=(m for m in ['json', 'json']),
+                                data=(d for d in ['a.txt', 'b.txt:bin'])) == 0
+    args = fake_pyinstaller[0]
+    assert args.count('--add-data') == 2
+    assert args.count('json') == 1
+
+    # the cache key was created from the same values that PyInstaller received
+    assert freeze_server32.main(dest=str(tmp_path / 'b'), skip_32bit_check=True,
+                                imports=['json'], data=['a.txt', 'b.txt:bin']) == 0
+    assert len(fake_pyinstaller) == 1
+
+
+def test_freeze_cache_key(monkeypatch, tmp_path):
+    here = tmp_path / 'here'
+    here.mkdir()
+    (here / 'utils.py').write_text('1')
+    (here / 'server32-linux').write_bytes(b'')
+    site_packages = tmp_path / 'site-packages'
+    site_packages.mkdir()
+    monkeypatch.setattr(freeze_server32, '_HERE', str(here))
+    monkeypatch.setattr(freeze_server32, '_site_packages', lambda: [str(site_packages)])
+
+    def key():
+        return freeze_server32._freeze_cache_key(pyinstaller_version='6.0.0', imports=(), data=())
+
+    k = key()
+    assert key() == k
+
+    # the contents of every module of msl-loadlib is part of the key
+    (here / 'utils.py').write_text('2')
+    assert key() != k
+    k = key()
+
+    # a package was installed
+    os.utime(site_packages, ns=(0, 0))
+    assert key() != k
+
+
+def test_main_onedir(fake_pyinstaller, monkeypatch, tmp_path):
+    monkeypatch.setattr(freeze_server32, '_get_standard_modules', lambda: ())
+
+    # a server in a directory is not cached
+    for dest in ('a', 'b'):
+        assert freeze_server32.main(dest=str(tmp_path / dest), onefile=False,
+                                    skip_32bit_check=True) == 0
+    assert len(fake_pyinstaller) == 2
+    assert '--onedir' in fake_pyinstaller[0]
+    assert '--onefile' not in fake_pyinstaller[0]
+    assert not os.path.isdir(os.path.join(freeze_server32._cache_dir(), 'frozen'))
+
+
+def test_main_spec_not_cached(fake_pyinstaller, tmp_path):
+    spec = tmp_path / 'server.spec'
+    spec.write_text('')
+
+    # a spec file may refer to other files, which are not part of the cache key
+    for dest in ('a', 'b'):
+        assert freeze_server32.main(spec=str(spec), dest=str(tmp_path / dest),
+                                    skip_32bit_check=True) == 0
+    assert len(fake_pyinstaller) == 2
+    assert not os.path.isdir(os.path.join(freeze_server32._cache_dir(), 'frozen'))
+
+
+def test_main_cache_evicted(fake_pyinstaller, monkeypatch, tmp_path):
+    monkeypatch.setattr(freeze_server32, '_get_standard_modules', lambda: ())
+    monkeypatch.setattr(freeze_server32, '_FROZEN_CACHE_SIZE', 2)
+    monkeypatch.chdir(tmp_path)
+
+    def freeze(value):
+        (tmp_path / 'mydata.txt').write_text(value)
+        return freeze_server32.main(dest=str(tmp_path / value), data='mydata.txt', skip_32bit_check=True)
+
+    frozen = os.path.join(freeze_server32._cache_dir(), 'frozen')
+    for value in ('1', '2', '1', '3'):
+        assert freeze(value) == 0
+        assert len(os.listdir(frozen)) <= 2
+    assert len(fake_pyinstaller) == 3
+
+    # the server for '1' was used more recently than the server for '2'
+    assert freeze('1') == 0
+    assert len(fake_pyinstaller) == 3
+    assert freeze('2') == 0
+    assert len(fake_pyinstaller) == 4
+
+
+def test_file_lock(tmp_path):
+    path = str(tmp_path / 'workpath.lock')
+    events = []
+
+    def worker():
+        with freeze_server32._file_lock(path):
+            events.append('worker')
+
+    with freeze_server32._file_lock(path):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join(0.2)
+        assert not events  # the worker is waiting for the lock
+        events.append('main')
+    thread.join()
+    assert events == ['main', 'worker']
+
+
+def test_thread_map():
+    assert freeze_server32._thread_map(str.upper, []) == []
+    assert freeze_server32._thread_map(str.upper, ['a']) == ['A']
+    assert freeze_server32._thread_map(str.upper, list('abcdefghijk')) == list('ABCDEFGHIJK')
+    with pytest.raises(ValueError, match="'x'"):
+        freeze_server32._thread_map(int, ['1', 'x', '2'])
+
+
+def test_create_version_info_file(tmp_path):
+    filename = freeze_server32._create_version_info_file(str(tmp_path))
+    assert [p.name for p in tmp_path.iterdir()] == [filename]
+    data = (tmp_path / filename).read_bytes()
+    assert data.startswith(b'# UTF-8')
+    # the copyright symbol is encoded as UTF-8
+    assert b"StringStruct('LegalCopyright', '\xc2\xa9 2017" in data
+
+
+def test_html_parser_not_imported():
+    code = ('import sys, msl.loadlib.freeze_server32; '
+            'assert "html.parser" not in sys.modules')
+    subprocess.check_call([sys.executable, '-c', code])
+
+
+def test_modindex_parser_chunks():
+    parser = freeze_server32._modindex_parser()
+    for char in MODINDEX_HTML.decode():
+        parser.feed(char)
+    parser.close()
+    assert tuple(parser.entries) == MODINDEX_ENTRIES
+
+
+def test_main_optimize(fake_pyinstaller, monkeypatch, tmp_path, capsys):
+    monkeypatch.setattr(freeze_server32, '_get_standard_modules', lambda: ())
+    assert freeze_server32.main(dest=str(tmp_path), skip_32bit_check=True, optimize=2) == 0
+    args = fake_pyinstaller[0]
+    assert args[args.index('--optimize') + 1] == '2'
+
+    monkeypatch.setattr(sys.modules['PyInstaller'], '__version__', '5.13.2')
+    assert freeze_server32.main(dest=str(tmp_path), skip_32bit_check=True, optimize=2) is None
+    assert 'PyInstaller >= 6.0' in capsys.readouterr().err
+    assert len(fake_pyinstaller) == 1
+
+
+def test_pyinstaller_version(monkeypatch):
+    def not_found(name):
+        raise importlib.metadata.PackageNotFoundError(name)
+
+    monkeypatch.setitem(sys.modules, 'PyInstaller', None)
+    assert freeze_server32._pyinstaller_version() is None
+
+    pyinstaller = types.ModuleType('PyInstaller')
+    pyinstaller.__spec__ = ModuleSpec('PyInstaller', None)
+    pyinstaller.__version__ = '6.1.0'
+    monkeypatch.setitem(sys.modules, 'PyInstaller', pyinstaller)
+    monkeypatch.setattr(importlib.metadata, 'version', lambda name: '6.2.0')
+    assert freeze_server32._pyinstaller_version() == '6.2.0'
+
+    monkeypatch.setattr(importlib.metadata, 'version', not_found)
+    assert freeze_server32._pyinstaller_version() == '6.1.0'
+
+
+def test_load_modindex_offline(monkeypatch, tmp_path):
+    def fetch_modindex(major, minor, **kwargs):
+        raise urllib.error.URLError('offline')
+
+    monkeypatch.setattr(freeze_server32, '_cache_dir', lambda: str(tmp_path))
+    monkeypatch.setattr(freeze_server32, '_fetch_modindex', fetch_modindex)
+    freeze_server32._load_modindex.cache_clear()
+
+    # nothing is cached
+    with pytest.raises(OSError):
+        freeze_server32._load_modindex(3, 11)
+
+    # an expired cache is used
+    path = tmp_path / 'py-modindex-3.11.json'
+    path.write_text(json.dumps({'etag': '', 'last_modified': '', 'entries': MODINDEX_ENTRIES}))
+    os.utime(path, (0, 0))
+    freeze_server32._load_modindex.cache_clear()
+    assert freeze_server32._load_modindex(3, 11) == MODINDEX_ENTRIES
+
+    freeze_server32._load_modindex.cache_clear()
+
+
+def test_load_stdlib_module_args(monkeypatch, tmp_path):
+    expanded = []
+
+    def expand_stdlib_modules(names):
+        expanded.append(names)
+        return ['winreg'], ['json', 'json.decoder']
+
+    monkeypatch.setattr(freeze_server32, '_cache_dir', lambda: str(tmp_path))
+    monkeypatch.setattr(freeze_server32, '_expand_stdlib_modules', expand_stdlib_modules)
+    args = ('--hidden-import', 'json', '--hidden-import', 'json.decoder', '--exclude-module', 'winreg')
+    assert freeze_server32._load_stdlib_module_args(['json', 'winreg']) == args
+    assert len(expanded) == 1
+
+    # loaded from the cache file
+    assert freeze_server32._load_stdlib_module_args(['winreg', 'json']) == args
+    assert len(expanded) == 1
+
+    # the names of the modules and the cache version are part of the key
+    assert freeze_server32._load_stdlib_module_args(['json', 'winreg', 'os']) == args
+    assert len(expanded) == 2
+    monkeypatch.setattr(freeze_server32, '_STDLIB_CACHE_VERSION', 0)
+    assert freeze_server32._load_stdlib_module_args(['json', 'winreg', 'os']) == args
+    assert len(expanded) == 3
+
+    # so are the version of msl-loadlib and the excluded modules
+    monkeypatch.setattr(freeze_server32.loadlib, '__version__', '0.0.0')
+    assert freeze_server32._load_stdlib_module_args(['json', 'winreg', 'os']) == args
+    assert len(expanded) == 4
+    monkeypatch.setattr(freeze_server32, '_EXCLUDE_MODULES', ('tkinter',))
+    assert freeze_server32._load_stdlib_module_args(['json', 'winreg', 'os']) == args
+    assert len(expanded) == 5
+    assert freeze_server32._load_stdlib_module_args(['json', 'winreg', 'os']) == args
+    assert len(expanded) == 5
+
+    # a corrupt cache file is ignored
+    for path in tmp_path.iterdir():
+        path.write_text('{')
+    assert freeze_server32._load_stdlib_module_args(['json', 'winreg', 'os']) == args
+    assert len(expanded) == 6
+
+
+def test_get_standard_modules_offline(monkeypatch):
+    def load_modindex(major, minor):
+        raise urllib.error.URLError('offline')
+
+    monkeypatch.setattr(freeze_server32, '_stdlib_module_names', lambda: None)
+    monkeypatch.setattr(freeze_server32, '_load_modindex', load_modindex)
+    freeze_server32._get_standard_modules.cache_clear()
+    modules = freeze_server32._get_standard_modules()
+    freeze_server32._get_standard_modules.cache_clear()
+    assert 'json.decoder' in modules
+    assert 'xml.etree.ElementTree' in modules
+
+
+def test_scan_stdlib_module_names():
+    names = freeze_server32._scan_stdlib_module_names()
+    assert 'os' in names
+    assert 'json' in names
+    assert 'textwrap' in names
+    assert 'test' not in names
+    assert not any(name.startswith('_test') for name in names)
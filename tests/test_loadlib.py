@@ -1,6 +1,9 @@
 import math
 import os
 import pathlib
+import subprocess
+import sys
+import types
 from ctypes import POINTER
 from ctypes import byref
 from ctypes import c_bool
@@ -29,6 +32,10 @@ from msl.examples.loadlib import NPoints
 from msl.examples.loadlib import Point
 from msl.loadlib import LoadLibrary
 from msl.loadlib.constants import *
+from msl.loadlib.load_library import DotNet
+from msl.loadlib.load_library import _find_library
+from msl.loadlib.load_library import _find_library_path
+from msl.loadlib.load_library import _find_py4j_jar
 from msl.loadlib.utils import get_com_info
 
 if IS_MACOS_ARM64:
@@ -48,6 +55,14 @@ def test_invalid_path(path):
         LoadLibrary(path)
 
 
+@pytest.mark.skipif(IS_WINDOWS, reason='WinDLL and OleDLL exist on Windows')
+@pytest.mark.parametrize('libtype', ['windll', 'oledll'])
+def test_stdcall_not_windows(libtype):
+    path = os.path.join(EXAMPLES_DIR, f'cpp_lib{suffix}')
+    with pytest.raises(OSError, match=rf'libtype={libtype!r} on this operating system'):
+        LoadLibrary(path, libtype)
+
+
 @pytest.mark.skipif(IS_MAC, reason='the 32-bit libraries do not exist for macOS')
 @pytest.mark.parametrize('filename', ['cpp_lib', 'fortran_lib'])
 def test_wrong_bitness(filename):
@@ -551,6 +566,159 @@ def test_path_attrib():
     assert LoadLibrary(pathlib.Path(path)).path == expected
 
 
+@pytest.mark.skipif(not IS_LINUX, reason='the filename of the C library is for Linux')
+def test_dynamic_linker_before_find_library(monkeypatch):
+    def find_library(name):
+        raise AssertionError('find_library should not be called')
+
+    monkeypatch.setattr('ctypes.util.find_library', find_library)
+    libc = LoadLibrary('libc.so.6')
+    assert os.path.isabs(libc.path)
+    assert os.path.basename(libc.path) == 'libc.so.6'
+    assert libc.lib.abs(-1) == 1
+
+    with pytest.raises(AssertionError, match='find_library'):
+        LoadLibrary('libdoes-not-exist.so')
+
+
+@pytest.mark.skipif(IS_WINDOWS, reason='ctypes uses LoadLibrary on Windows')
+def test_ctypes_handle_reused(monkeypatch, tmp_path):
+    path = os.path.join(EXAMPLES_DIR, f'cpp_lib{suffix}')
+    cpp1 = LoadLibrary(path)
+    cpp1.lib.add.restype = c_float
+
+    def dlopen(*args):
+        raise AssertionError('the library should not be loaded again')
+
+    monkeypatch.setattr('ctypes._dlopen', dlopen)
+    cpp2 = LoadLibrary(path)
+    assert cpp2.lib is not cpp1.lib
+    assert cpp2.lib._handle == cpp1.lib._handle
+    assert cpp2.lib.add.restype is not c_float
+    assert cpp2.lib.add(1, 2) == 3
+
+    # a different mode requires the library to be loaded
+    with pytest.raises(AssertionError, match='should not be loaded again'):
+        LoadLibrary(path, mode=os.RTLD_NOW | os.RTLD_GLOBAL)
+
+    # the handle is cached for the file that a symbolic link resolves to
+    link = tmp_path / f'link{DEFAULT_EXTENSION}'
+    link.symlink_to(path + DEFAULT_EXTENSION)
+    cpp3 = LoadLibrary(link)
+    assert cpp3.path == str(link)
+    assert cpp3.lib._handle == cpp1.lib._handle
+
+    LoadLibrary.clear_cache()
+    with pytest.raises(AssertionError, match='should not be loaded again'):
+        LoadLibrary(path)
+
+
+def test_import_is_lazy():
+    # Client64 and Server32 are imported on first access
+    code = ('import sys, msl.loadlib; '
+            'assert "msl.loadlib.client64" not in sys.modules; '
+            'assert "msl.loadlib.server32" not in sys.modules; '
+            'assert "Client64" in dir(msl.loadlib); '
+            'assert "Server32" in dir(msl.loadlib); '
+            'assert "msl.loadlib.client64" not in sys.modules; '
+            'from msl.loadlib import *; '
+            'assert Client64 is msl.loadlib.client64.Client64; '
+            'assert Server32 is msl.loadlib.server32.Server32; '
+            'assert client64 is sys.modules["msl.loadlib.client64"]; '
+            'assert utils is msl.loadlib.utils; '
+            'assert __version__ == msl.loadlib.__version__')
+    subprocess.check_call([sys.executable, '-c', code])
+
+
+def test_find_py4j_jar(monkeypatch, tmp_path):
+    jar = tmp_path / 'py4j0.0.jar'
+    with pytest.raises(OSError, match=r'the full path to py4j0.0.jar is invalid'):
+        _find_py4j_jar(str(jar), 'py4j0.0.jar')
+
+    # the file is found after it is created (an error is not cached)
+    jar.write_bytes(b'')
+    assert _find_py4j_jar(str(jar), 'py4j0.0.jar') == str(jar)
+
+    # the path is cached
+    monkeypatch.setattr(os.path, 'isfile', lambda path: False)
+    assert _find_py4j_jar(str(jar), 'py4j0.0.jar') == str(jar)
+    _find_py4j_jar.cache_clear()
+
+
+def test_dotnet_lazy_import():
+    def system_type(namespace, name):
+        full_name = f'{namespace}.{name}' if namespace else name
+        return types.SimpleNamespace(Namespace=namespace, FullName=full_name)
+
+    net_types = [
+        system_type('json.decoder', 'JSONDecoder'),
+        system_type('json', 'JSONEncoder'),
+        system_type('does_not_exist', 'Class'),
+        system_type(None, 'StaticClass'),
+    ]
+    lib = DotNet({'System': None}, 'dotnet.dll', net_types)
+    assert 'json' not in vars(lib)
+    assert 'json' in dir(lib)
+
+    import json
+    assert lib.json is json
+    assert 'json' in vars(lib)
+    assert 'StaticClass' not in vars(lib)
+    assert lib.System is None
+
+    # a type that cannot be imported is accessed by its full name
+    assert getattr(lib, 'does_not_exist.Class') is net_types[2]
+    assert lib.StaticClass is net_types[3]  # clr is not installed or the class does not exist
+    with pytest.raises(AttributeError, match="'DotNet' object has no attribute 'Unknown'"):
+        _ = lib.Unknown
+
+
+def test_find_library_path_search_dirs(monkeypatch, tmp_path):
+    dirs = [tmp_path / str(i) for i in range(10)]
+    for d in dirs:
+        d.mkdir()
+    lib = dirs[-1] / 'my_library.so'
+    lib.write_bytes(b'')
+
+    monkeypatch.setattr('ctypes.util.find_library', lambda name: None)
+    monkeypatch.setattr(sys, 'path', [str(d) for d in dirs])
+    monkeypatch.setenv('PATH', os.pathsep.join(str(d) for d in dirs))
+    assert _find_library_path('my_library', 'my_library.so', 'cdll') == str(lib)
+
+    isfile_calls = []
+    isfile = os.path.isfile
+
+    def count_isfile(path):
+        isfile_calls.append(path)
+        return isfile(path)
+
+    # the file that was found is checked first
+    monkeypatch.setattr(os.path, 'isfile', count_isfile)
+    assert _find_library_path('my_library', 'my_library.so', 'cdll') == str(lib)
+    assert isfile_calls == [str(lib)]
+
+    # the directories are searched again if the file no longer exists
+    lib.unlink()
+    with pytest.raises(OSError, match=r"Cannot find 'my_library'"):
+        _find_library_path('my_library', 'my_library.so', 'cdll')
+    assert len(isfile_calls) == 1 + 1 + len(dirs)
+
+
+def test_find_library_cached(monkeypatch):
+    calls = []
+
+    def find_library(name):
+        calls.append(name)
+        return None
+
+    monkeypatch.setattr('ctypes.util.find_library', find_library)
+    _find_library.cache_clear()
+    assert _find_library('my_library') is None
+    assert _find_library('my_library') is None
+    assert calls == ['my_library']
+    _find_library.cache_clear()
+
+
 @skipif_no_pythonnet
 def test_dotnet_nested_namespace():
     net = LoadLibrary('./tests/nested_namespaces/nested_namespaces.dll', 'clr')
@@ -3,6 +3,7 @@ import shutil
 import socket
 import sys
 import tempfile
+import time
 from xml.etree import ElementTree
 
 import pytest
@@ -18,6 +19,15 @@ def test_timeout():
         utils.wait_for_server('localhost', utils.get_available_port(), 2)
 
 
+def test_wait_for_server():
+    with socket.socket() as sock:
+        sock.bind(('localhost', 0))
+        sock.listen(1)
+        t0 = time.perf_counter()
+        utils.wait_for_server('localhost', sock.getsockname()[1], 2)
+        assert time.perf_counter() - t0 < 1
+
+
 def test_port_functions():
     port = utils.get_available_port()
     assert not utils.is_port_in_use(port)